@@ -1,6 +1,9 @@
 """The PiKVM integration."""
 
 import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+import functools
 import logging
 
 import voluptuous as vol
@@ -10,27 +13,45 @@ from homeassistant.core import HomeAssistant
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 
 from .cert_handler import format_url
 from .const import (
+    CONF_ADDITIONAL_ADDRESSES,
     CONF_CERTIFICATE,
     CONF_HOST,
     CONF_PASSWORD,
     CONF_SERIAL,
+    CONF_SNAPSHOT_INTERVAL,
+    CONF_SNAPSHOT_MAX_SIZE_MB,
+    CONF_SNAPSHOT_RETENTION_DAYS,
     CONF_USERNAME,
     CONF_TOTP,
+    DATA_SNAPSHOT_ARCHIVE,
+    DEFAULT_ADDITIONAL_ADDRESSES,
     DEFAULT_PASSWORD,
+    DEFAULT_SNAPSHOT_INTERVAL,
+    DEFAULT_SNAPSHOT_MAX_SIZE_MB,
+    DEFAULT_SNAPSHOT_RETENTION_DAYS,
     DEFAULT_USERNAME,
     DOMAIN,
     MANUFACTURER,
 )
-from .coordinator import PiKVMDataUpdateCoordinator
+from .coordinator import PiKVMDataUpdateCoordinator, PiKVMRequestError
 from .entity import PiKVMEntity
-from .utils import get_nested_value
+from .entry_index import async_get_serial_index
+from .kvm_switch import KVMSwitchDispatcher
+from .services import async_setup_services
+from .state_cache import PiKVMStateCache
+from .utils import get_nested_value, parse_addresses
+from .websocket import PiKVMEventStream
+from .write_filter import WriteFilter
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS = ["binary_sensor", "button", "select", "sensor", "switch"]
+
 # Define a minimal CONFIG_SCHEMA
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -49,6 +70,9 @@ CONFIG_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the PiKVM component."""
+    async_setup_services(hass)
+    # Discovery and the flows look entries up by serial
+    async_get_serial_index(hass)
     return True
 
 
@@ -73,10 +97,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry.data.get(CONF_TOTP, ""),
         entry.data[CONF_CERTIFICATE],
     )
+    coordinator.additional_addresses = parse_addresses(
+        entry.options.get(CONF_ADDITIONAL_ADDRESSES, DEFAULT_ADDITIONAL_ADDRESSES)
+    )
     
     await coordinator.async_setup()
-    await coordinator.async_config_entry_first_refresh()
 
+    # Start from the last known state so setup does not wait for the device;
+    # only a device never seen before has to answer before entities exist
+    state_cache = PiKVMStateCache(hass, entry.entry_id)
+    cached_data = await state_cache.async_load()
+    if cached_data is None:
+        await coordinator.async_config_entry_first_refresh()
+    else:
+        _LOGGER.debug("Starting %s from its cached state", entry.title)
+        coordinator.async_set_cached_data(cached_data)
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.title}"
+        )
+    entry.async_on_unload(state_cache.async_track(coordinator))
+
+    coordinator.write_filter = WriteFilter.from_options(entry.options)
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     # Retrieve hardware and system information safely
@@ -94,17 +135,80 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         sw_version=kvmd.get("version"),
     )
 
-    # Forward the setup to the sensor platform
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+    # Per-port KVM switch entities are only notified when their port changes
+    entry.async_on_unload(KVMSwitchDispatcher(coordinator).async_start())
+
+    # Forward the setup to the entity platforms
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Push updates (ATX LEDs, etc.) arrive over a persistent websocket
+    coordinator.event_stream = PiKVMEventStream(coordinator)
+    coordinator.event_stream.async_start()
 
     # Clean up orphaned devices that were created by previous versions
     await _async_cleanup_devices(hass, entry)
 
+    coordinator.snapshot_archive_stop = _async_setup_snapshot_archive(
+        hass, entry, coordinator
+    )
+    entry.async_on_unload(functools.partial(_async_stop_snapshot_archive, coordinator))
+
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
     return True
 
 
+def _async_setup_snapshot_archive(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: PiKVMDataUpdateCoordinator
+) -> Callable[[], Awaitable[None]] | None:
+    """Periodically archive snapshots for this entry when enabled in options.
+
+    Returns a coroutine function stopping the archiving, or None if disabled.
+    """
+    interval = entry.options.get(CONF_SNAPSHOT_INTERVAL, DEFAULT_SNAPSHOT_INTERVAL)
+    if not interval:
+        return None
+
+    # pylint: disable=import-outside-toplevel
+    from .snapshot_archive import SnapshotArchive
+
+    archive = hass.data.get(DATA_SNAPSHOT_ARCHIVE)
+    if archive is None:
+        archive = hass.data[DATA_SNAPSHOT_ARCHIVE] = SnapshotArchive(hass)
+
+    serial = entry.data[CONF_SERIAL]
+    archive.async_register(
+        serial,
+        entry.options.get(CONF_SNAPSHOT_RETENTION_DAYS, DEFAULT_SNAPSHOT_RETENTION_DAYS),
+        entry.options.get(CONF_SNAPSHOT_MAX_SIZE_MB, DEFAULT_SNAPSHOT_MAX_SIZE_MB),
+    )
+
+    async def _async_capture(_now) -> None:
+        try:
+            data = await coordinator.async_fetch_snapshot()
+        except PiKVMRequestError as err:
+            _LOGGER.debug("Skipping snapshot for %s: %s", serial, err)
+            return
+        archive.async_add(serial, data)
+
+    unsub_capture = async_track_time_interval(
+        hass, _async_capture, timedelta(seconds=interval)
+    )
+
+    async def _async_stop() -> None:
+        unsub_capture()
+        await archive.async_unregister(serial)
+
+    return _async_stop
+
+
+async def _async_stop_snapshot_archive(coordinator: PiKVMDataUpdateCoordinator) -> None:
+    """Stop archiving snapshots of an entry, if it was enabled."""
+    if coordinator.snapshot_archive_stop is not None:
+        await coordinator.snapshot_archive_stop()
+        coordinator.snapshot_archive_stop = None
+
+
 async def _async_cleanup_devices(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Remove devices that have no entities and belong to this config entry."""
     dev_reg = dr.async_get(hass)
@@ -120,15 +224,65 @@ async def _async_cleanup_devices(hass: HomeAssistant, entry: ConfigEntry) -> Non
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    await hass.config_entries.async_forward_entry_unload(entry, "sensor")
-    hass.data[DOMAIN].pop(entry.entry_id, None)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+    if coordinator is not None:
+        await coordinator.async_shutdown()
 
-    return True
+    return unload_ok
 
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply changed data and options to the running entry.
+
+    Connection settings and options are applied to the live coordinator. Only
+    a different device, whose entities have other unique IDs, needs a reload.
+    """
+    coordinator: PiKVMDataUpdateCoordinator | None = hass.data[DOMAIN].get(
+        entry.entry_id
+    )
+    if coordinator is None:
+        return
+    if (DOMAIN, entry.data[CONF_SERIAL]) not in coordinator.device_info["identifiers"]:
+        _LOGGER.debug("%s now points to another device, reloading", entry.title)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    connection = (
+        entry.data[CONF_HOST],
+        entry.data[CONF_USERNAME],
+        entry.data[CONF_PASSWORD],
+        entry.data.get(CONF_TOTP, ""),
+        entry.data[CONF_CERTIFICATE],
+    )
+    if coordinator.connection_changed(*connection):
+        _LOGGER.debug("Applying new connection settings to %s", entry.title)
+        await coordinator.async_update_connection(*connection)
+        _async_update_configuration_url(hass, entry, coordinator)
+
+    coordinator.additional_addresses = parse_addresses(
+        entry.options.get(CONF_ADDITIONAL_ADDRESSES, DEFAULT_ADDITIONAL_ADDRESSES)
+    )
+    write_filter = WriteFilter.from_options(entry.options)
+    write_filter.counts = coordinator.write_filter.counts
+    coordinator.write_filter = write_filter
+
+    await _async_stop_snapshot_archive(coordinator)
+    coordinator.snapshot_archive_stop = _async_setup_snapshot_archive(
+        hass, entry, coordinator
+    )
+
+
+def _async_update_configuration_url(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: PiKVMDataUpdateCoordinator
+) -> None:
+    """Point the device page link at the configured URL."""
+    configuration_url = coordinator.configured_url
+    coordinator.device_info["configuration_url"] = configuration_url
+    dev_reg = dr.async_get(hass)
+    device = dev_reg.async_get_device(identifiers={(DOMAIN, entry.data[CONF_SERIAL])})
+    if device is not None:
+        dev_reg.async_update_device(device.id, configuration_url=configuration_url)
 
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -137,4 +291,6 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_forward_entry_unload(entry, "sensor")
 
     # Remove the entry from the 'pikvm' domain data
-    hass.data[DOMAIN].pop(entry.entry_id, None)
\ No newline at end of file
+    hass.data[DOMAIN].pop(entry.entry_id, None)
+
+    await PiKVMStateCache(hass, entry.entry_id).async_remove()
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""Racing connections to the addresses a PiKVM is reachable at.
+
+A device may answer on its configured host, on IPv4 and IPv6 addresses
+announced over zeroconf, or through a VPN. Following RFC 8305 (Happy
+Eyeballs), a TCP connection is started to each candidate in turn, the next
+one after ATTEMPT_DELAY or as soon as the previous attempt failed, and the
+first to connect wins. A dead path therefore costs a quarter of a second
+instead of a full request timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+import contextlib
+import ipaddress
+from urllib.parse import urlparse
+
+ATTEMPT_DELAY = 0.25
+RACE_TIMEOUT = 5
+
+
+def address_url(address: str, base_url: str) -> str:
+    """Return the URL of an address with the scheme and port of base_url.
+
+    IPv6 literals are bracketed.
+    """
+    parsed = urlparse(base_url)
+    host = address
+    with contextlib.suppress(ValueError):
+        if ipaddress.ip_address(address).version == 6:
+            host = f"[{address}]"
+    if parsed.port is not None:
+        host = f"{host}:{parsed.port}"
+    return f"{parsed.scheme or 'https'}://{host}"
+
+
+def is_usable_address(address: str) -> bool:
+    """Return whether an announced address can be connected to as is.
+
+    Link-local IPv6 addresses need an interface scope that zeroconf does not
+    provide, and loopback addresses point at Home Assistant itself.
+    """
+    try:
+        parsed = ipaddress.ip_address(address)
+    except ValueError:
+        return bool(address)
+    return not parsed.is_loopback and not (parsed.version == 6 and parsed.is_link_local)
+
+
+async def _async_connect(host: str, port: int) -> None:
+    _reader, writer = await asyncio.open_connection(host, port)
+    writer.close()
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+
+
+async def async_race(
+    targets: Sequence[tuple[str, int]],
+    attempt_delay: float = ATTEMPT_DELAY,
+    timeout: float = RACE_TIMEOUT,
+) -> int | None:
+    """Return the index of the first target accepting a connection, or None."""
+    attempts: dict[asyncio.Task, int] = {}
+    pending: set[asyncio.Task] = set()
+    remaining = iter(enumerate(targets))
+    try:
+        async with asyncio.timeout(timeout):
+            while True:
+                started = next(remaining, None)
+                if started is not None:
+                    index, (host, port) = started
+                    task = asyncio.create_task(_async_connect(host, port))
+                    attempts[task] = index
+                    pending.add(task)
+                elif not pending:
+                    return None
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=attempt_delay if started is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                # Read every exception, so failed attempts are not reported
+                # as never retrieved
+                connected = [
+                    attempts[task] for task in done if task.exception() is None
+                ]
+                if connected:
+                    return min(connected)
+    except TimeoutError:
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
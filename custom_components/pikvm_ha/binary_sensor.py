@@ -0,0 +1,154 @@
+"""Platform for binary sensor integration."""
+
+import logging
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, STREAMER_WRITE_INTERVAL
+from .entity import PiKVMEntity, PiKVMGpioEntity, PiKVMSwitchPortEntity
+from .kvm_switch import get_port_label, get_ports
+from .utils import (
+    get_device_name,
+    get_gpio_channels,
+    get_nested_value,
+    get_unique_id_base,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Port state key, entity name suffix, device class, icon
+SWITCH_PORT_SENSORS = (
+    ("active", "Active", None, "mdi:video-switch"),
+    ("signal", "Signal", BinarySensorDeviceClass.CONNECTIVITY, "mdi:video-input-hdmi"),
+    ("power", "Power", BinarySensorDeviceClass.POWER, "mdi:power"),
+)
+
+
+class PiKVMAtxLedBinarySensor(PiKVMEntity, BinarySensorEntity):
+    """Binary sensor reporting an ATX front panel LED, updated by push events."""
+
+    _push_events = ("atx",)
+
+    def __init__(self, coordinator, unique_id_base, device_name, led, name, icon) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, unique_id_base)
+        self._attr_unique_id = f"{unique_id_base}_atx_{led}_led"
+        self._attr_name = f"{device_name} {name}"
+        self._attr_icon = icon
+        if led == "power":
+            self._attr_device_class = BinarySensorDeviceClass.POWER
+        self._led = led
+
+    @property
+    def available(self) -> bool:
+        """Return True once kvmd has reported the ATX state."""
+        return super().available and get_nested_value(
+            self.coordinator.push_state, ["atx", "enabled"], False
+        )
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the LED is lit."""
+        return get_nested_value(self.coordinator.push_state, ["atx", "leds", self._led])
+
+
+class PiKVMStreamerSignalBinarySensor(PiKVMEntity, BinarySensorEntity):
+    """Binary sensor reporting whether the video capture has a signal."""
+
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _push_events = ("streamer",)
+    _push_min_interval = STREAMER_WRITE_INTERVAL
+
+    def __init__(self, coordinator, unique_id_base, device_name) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, unique_id_base)
+        self._attr_unique_id = f"{unique_id_base}_streamer_signal"
+        self._attr_name = f"{device_name} Video Signal"
+        self._attr_icon = "mdi:video-input-hdmi"
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the capture source is online."""
+        return get_nested_value(
+            self.coordinator.push_state, ["streamer", "streamer", "source", "online"]
+        )
+
+
+class PiKVMGpioInputBinarySensor(PiKVMGpioEntity, BinarySensorEntity):
+    """Binary sensor reporting a GPIO input channel."""
+
+    def __init__(self, coordinator, unique_id_base, device_name, channel) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, unique_id_base, device_name, "inputs", channel)
+        self._attr_unique_id = f"{unique_id_base}_gpio_{channel}"
+        self._attr_icon = "mdi:electric-switch-closed"
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return the channel state."""
+        return self._channel_state.get("state")
+
+
+class PiKVMSwitchPortBinarySensor(PiKVMSwitchPortEntity, BinarySensorEntity):
+    """Binary sensor reporting the active, signal or power state of a switch port."""
+
+    def __init__(
+        self, coordinator, unique_id_base, device_name, port, label, key, name, device_class, icon
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, unique_id_base, device_name, port, label)
+        self._attr_unique_id = f"{unique_id_base}_switch_port_{port}_{key}"
+        self._attr_name = f"{self._attr_name} {name}"
+        self._attr_device_class = device_class
+        self._attr_icon = icon
+        self._key = key
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return the port state."""
+        return self._port_state[self._key]
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up PiKVM binary sensors from a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    unique_id_base = get_unique_id_base(config_entry, coordinator)
+    device_name = get_device_name(coordinator)
+
+    entities = [
+        PiKVMAtxLedBinarySensor(
+            coordinator, unique_id_base, device_name, "power", "Power LED", "mdi:led-on"
+        ),
+        PiKVMAtxLedBinarySensor(
+            coordinator, unique_id_base, device_name, "hdd", "HDD LED", "mdi:harddisk"
+        ),
+        PiKVMStreamerSignalBinarySensor(coordinator, unique_id_base, device_name),
+    ]
+    entities.extend(
+        PiKVMGpioInputBinarySensor(coordinator, unique_id_base, device_name, channel)
+        for channel in get_gpio_channels(coordinator, "inputs")
+    )
+    ports = get_ports(coordinator)
+    entities.extend(
+        PiKVMSwitchPortBinarySensor(
+            coordinator,
+            unique_id_base,
+            device_name,
+            port,
+            get_port_label(ports, port),
+            *sensor,
+        )
+        for port in range(len(ports))
+        for sensor in SWITCH_PORT_SENSORS
+    )
+    async_add_entities(entities)
@@ -0,0 +1,100 @@
+"""Platform for button integration."""
+
+import logging
+
+from homeassistant.components.button import ButtonEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import PiKVMRequestError
+from .entity import PiKVMEntity, PiKVMGpioEntity
+from .utils import (
+    get_device_name,
+    get_gpio_channels,
+    get_nested_value,
+    get_unique_id_base,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# kvmd button name, entity name suffix, icon
+ATX_BUTTONS = (
+    ("power", "ATX Power Button", "mdi:power"),
+    ("power_long", "ATX Power Long Press", "mdi:power-off"),
+    ("reset", "ATX Reset", "mdi:restart"),
+)
+
+
+class PiKVMAtxButton(PiKVMEntity, ButtonEntity):
+    """Button pressing one of the ATX buttons of the attached host."""
+
+    _push_events = ("atx",)
+
+    def __init__(self, coordinator, unique_id_base, device_name, button, name, icon) -> None:
+        """Initialize the button."""
+        super().__init__(coordinator, unique_id_base)
+        self._attr_unique_id = f"{unique_id_base}_atx_{button}"
+        self._attr_name = f"{device_name} {name}"
+        self._attr_icon = icon
+        self._button = button
+
+    @property
+    def available(self) -> bool:
+        """Return True if ATX control is enabled on the device."""
+        return super().available and get_nested_value(
+            self.coordinator.push_state, ["atx", "enabled"], False
+        )
+
+    async def async_press(self) -> None:
+        """Press the ATX button."""
+        try:
+            await self.coordinator.async_atx_click(self._button)
+        except PiKVMRequestError as err:
+            raise HomeAssistantError(
+                f"Failed to press ATX button {self._button}: {err}"
+            ) from err
+
+
+class PiKVMGpioPulseButton(PiKVMGpioEntity, ButtonEntity):
+    """Button sending a pulse on a GPIO output channel."""
+
+    def __init__(self, coordinator, unique_id_base, device_name, channel) -> None:
+        """Initialize the button."""
+        super().__init__(coordinator, unique_id_base, device_name, "outputs", channel)
+        self._attr_unique_id = f"{unique_id_base}_gpio_{channel}_pulse"
+        self._attr_name = f"{device_name} GPIO {channel} Pulse"
+        self._attr_icon = "mdi:gesture-tap-button"
+
+    async def async_press(self) -> None:
+        """Send the pulse."""
+        try:
+            await self.coordinator.async_gpio_pulse(self._channel)
+        except PiKVMRequestError as err:
+            raise HomeAssistantError(
+                f"Failed to pulse GPIO channel {self._channel}: {err}"
+            ) from err
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up PiKVM buttons from a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    unique_id_base = get_unique_id_base(config_entry, coordinator)
+    device_name = get_device_name(coordinator)
+
+    entities = [
+        PiKVMAtxButton(coordinator, unique_id_base, device_name, button, name, icon)
+        for button, name, icon in ATX_BUTTONS
+    ]
+    entities.extend(
+        PiKVMGpioPulseButton(coordinator, unique_id_base, device_name, channel)
+        for channel, scheme in get_gpio_channels(coordinator, "outputs").items()
+        if get_nested_value(scheme, ["pulse", "delay"], 0) > 0
+    )
+    async_add_entities(entities)
@@ -26,43 +26,51 @@ import ssl
 import tempfile
 import warnings
 
-import OpenSSL
-import requests
-from requests.adapters import HTTPAdapter
-from requests.auth import HTTPBasicAuth
-from urllib3.exceptions import InsecureRequestWarning
-
 from homeassistant.core import HomeAssistant
 
 from .const import CONF_HOST, CONF_MODEL, CONF_NAME, CONF_SERIAL
 
-warnings.simplefilter("ignore", InsecureRequestWarning)
-
 _LOGGER = logging.getLogger(__name__)
 
 
-class SSLContextAdapter(HTTPAdapter):
-    """An HTTP adapter that uses a custom SSL context."""
+# requests is only needed once a session is created, so it is imported on
+# first use rather than when Home Assistant loads the integration.
+# pylint: disable=import-outside-toplevel
+@functools.cache
+def _ssl_context_adapter_class():
+    """Return the SSLContextAdapter class, importing requests on first use."""
+    from requests.adapters import HTTPAdapter
+    from urllib3.exceptions import InsecureRequestWarning
+
+    # The pinned certificate is checked by the SSL context, not by urllib3
+    warnings.simplefilter("ignore", InsecureRequestWarning)
 
-    def __init__(self, ssl_context, *args, **kwargs) -> None:
-        """Initialize the adapter with the custom SSL context. This method is called by the session."""
-        self.ssl_context = ssl_context
-        super().__init__(*args, **kwargs)
+    class SSLContextAdapter(HTTPAdapter):
+        """An HTTP adapter that uses a custom SSL context."""
 
-    def init_poolmanager(self, *args, **kwargs) -> None:
-        """Initialize the pool manager with the custom SSL context. This method is called by the session."""
-        kwargs["ssl_context"] = self.ssl_context
-        super().init_poolmanager(*args, **kwargs)
+        def __init__(self, ssl_context, *args, **kwargs) -> None:
+            """Initialize the adapter with the custom SSL context. This method is called by the session."""
+            self.ssl_context = ssl_context
+            super().__init__(*args, **kwargs)
 
-    def cert_verify(self, conn, *args, **kwargs) -> None:
-        """Disable certificate verification. This method is called by the pool manager."""
-        conn.assert_hostname = False
-        conn.cert_reqs = ssl.CERT_NONE
+        def init_poolmanager(self, *args, **kwargs) -> None:
+            """Initialize the pool manager with the custom SSL context. This method is called by the session."""
+            kwargs["ssl_context"] = self.ssl_context
+            super().init_poolmanager(*args, **kwargs)
+
+        def cert_verify(self, conn, *args, **kwargs) -> None:
+            """Disable certificate verification. This method is called by the pool manager."""
+            conn.assert_hostname = False
+            conn.cert_reqs = ssl.CERT_NONE
+
+    return SSLContextAdapter
 
 
 async def create_session_with_cert(hass: HomeAssistant | None, serialized_cert=None):
     cert_file_path = None
     try:
+        import requests
+
         session = requests.Session()
 
         # Create an SSL context that disables all verifications
@@ -81,7 +89,7 @@ async def create_session_with_cert(hass: HomeAssistant | None, serialized_cert=N
             else:
                 context.load_verify_locations(cert_file_path)
 
-        adapter = SSLContextAdapter(context)
+        adapter = _ssl_context_adapter_class()(context)
         session.mount("https://", adapter)
 
         _LOGGER.debug("Created session with custom SSL context using the certificate")
@@ -91,6 +99,21 @@ async def create_session_with_cert(hass: HomeAssistant | None, serialized_cert=N
         return None, None
 
 
+def _create_ssl_context(serialized_cert=None) -> ssl.SSLContext:
+    """Create an SSL context trusting the pinned PiKVM certificate."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    if serialized_cert:
+        context.load_verify_locations(cadata=serialized_cert)
+    return context
+
+
+async def create_ssl_context(hass: HomeAssistant, serialized_cert=None) -> ssl.SSLContext:
+    """Create the SSL context used by the aiohttp client session."""
+    return await hass.async_add_executor_job(_create_ssl_context, serialized_cert)
+
+
 async def fetch_serialized_cert(hass: HomeAssistant, url: str) -> str:
     """Fetch and serialize the certificate."""
     return await hass.async_add_executor_job(_fetch_and_serialize_cert, url)
@@ -122,18 +145,13 @@ def _fetch_and_serialize_cert(url):
         )
         conn.connect((hostname, port))
 
-        # Get the certificate
+        # Get the certificate and serialize it
         cert = conn.getpeercert(True)
-        x509 = OpenSSL.crypto.load_certificate(OpenSSL.crypto.FILETYPE_ASN1, cert)
-
-        # Serialize the certificate
-        serialized_cert = OpenSSL.crypto.dump_certificate(
-            OpenSSL.crypto.FILETYPE_PEM, x509
-        ).decode("utf-8")
+        serialized_cert = ssl.DER_cert_to_PEM_cert(cert)
         conn.close()
         return serialized_cert  # noqa: TRY300
 
-    except (OSError, ssl.SSLError, OpenSSL.crypto.Error) as e:
+    except (OSError, ssl.SSLError, ValueError) as e:
         _LOGGER.error("Error fetching or serializing certificate from %s: %s", url, e)
         if "conn" in locals() and conn:
             conn.close()
@@ -169,6 +187,9 @@ async def is_pikvm_device(
     code if an error occurred. The error code may contain an HTTP status code.
 
     """
+    import requests
+    from requests.auth import HTTPBasicAuth
+
     url = format_url(url)
     _LOGGER.debug("Checking PiKVM device at %s with username %s", url, username)
 
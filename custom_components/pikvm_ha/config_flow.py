@@ -2,6 +2,7 @@
 
 import logging
 import re
+from typing import Any
 import pyotp
 import binascii
 
@@ -26,6 +27,11 @@ from .const import (
     DOMAIN,
     MANUFACTURER,
 )
+from .discovery import (
+    async_get_discovery_coalescer,
+    async_resolve_entry_addresses,
+    host_moved,
+)
 from .options_flow import PiKVMOptionsFlowHandler
 from .utils import (
     create_data_schema,
@@ -155,45 +161,82 @@ class PiKVMConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if not serial or not host:
             _LOGGER.debug("Discovered device with ZeroConf but missing serial or host")
             return self.async_abort(reason="missing_serial_or_host")
-        # Filter out IPv6 addresses
+        addresses = [str(address) for address in discovery_info.ip_addresses]
+        addresses.append(discovery_info.hostname)
+        # IPv6 hosts are not configured, but kept as candidates of known devices
         if host.find(":") != -1:
-            _LOGGER.debug("Discovered device with ZeroConf but IPv6 address")
-            return self.async_abort(reason="ipv6_address")
+            existing_entry = find_existing_entry(self, serial)
+            if existing_entry is None:
+                _LOGGER.debug("Discovered device with ZeroConf but IPv6 address")
+                return self.async_abort(reason="ipv6_address")
+            self._async_set_discovered_addresses(existing_entry, addresses)
+            return self.async_abort(reason="already_configured")
         _LOGGER.debug(
             "Discovered device with ZeroConf: host=%s, serial=%s, model=%s",
             host,
             serial,
             discovery_info.properties.get("model"),
         )
+        return await self._async_step_discovered(host, serial, addresses)
+
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> config_entries.ConfigFlowResult:
+        """Handle a PiKVM found by the network scanner."""
+        host = discovery_info["host"]
+        serial = discovery_info[CONF_SERIAL]
+        _LOGGER.debug("Discovered device by scanning: host=%s, serial=%s", host, serial)
+        # A scan sees one address per device; keep the host of an entry that
+        # already reaches the device there, by hostname or another address
+        existing_entry = find_existing_entry(self, serial)
+        if existing_entry and host in await async_resolve_entry_addresses(
+            existing_entry
+        ):
+            _LOGGER.debug("Scanned address of %s is already known", serial)
+            return self.async_abort(reason="already_configured")
+        return await self._async_step_discovered(host, serial, [host])
+
+    async def _async_step_discovered(
+        self, host: str, serial: str, addresses: list[str]
+    ) -> config_entries.ConfigFlowResult:
+        """Update the host of a configured device or offer to add a new one."""
         existing_entry = find_existing_entry(self, serial)
         existing_totp = ""
         if existing_entry:
-            _LOGGER.debug(
-                "Device with serial %s already configured, updating existing entry",
-                serial,
-            )
-            existing_username = existing_entry.data.get(CONF_USERNAME, DEFAULT_USERNAME)
-            existing_password = existing_entry.data.get(CONF_PASSWORD, DEFAULT_PASSWORD)
-            existing_totp = existing_entry.data.get(CONF_TOTP, "")
-            _LOGGER.debug(
-                "Updating existing entry with host=%s, username=%s, password=%s",
-                host,
-                existing_username,
-                re.sub(r'.', '*', existing_password),
-            )
-            update_existing_entry(
-                self.hass,
-                existing_entry,
-                {
-                    CONF_HOST: host,
-                    CONF_USERNAME: existing_username,
-                    CONF_PASSWORD: existing_password,
-                    CONF_TOTP: existing_totp,
-                    "serial": serial,  # Ensure serial is included
-                },
+            _LOGGER.debug("Device with serial %s already configured", serial)
+
+            @callback
+            def _async_update_host() -> None:
+                if not host_moved(existing_entry, host, addresses):
+                    _LOGGER.debug("Host of %s is unchanged", serial)
+                    return
+                existing_username = existing_entry.data.get(CONF_USERNAME, DEFAULT_USERNAME)
+                existing_password = existing_entry.data.get(CONF_PASSWORD, DEFAULT_PASSWORD)
+                _LOGGER.debug(
+                    "Updating existing entry with host=%s, username=%s, password=%s",
+                    host,
+                    existing_username,
+                    re.sub(r'.', '*', existing_password),
+                )
+                update_existing_entry(
+                    self.hass,
+                    existing_entry,
+                    {
+                        CONF_HOST: host,
+                        CONF_USERNAME: existing_username,
+                        CONF_PASSWORD: existing_password,
+                        CONF_TOTP: existing_entry.data.get(CONF_TOTP, ""),
+                        "serial": serial,  # Ensure serial is included
+                    },
+                )
+
+            self._async_set_discovered_addresses(existing_entry, addresses)
+            async_get_discovery_coalescer(self.hass).async_discovered(
+                serial, _async_update_host
             )
             return self.async_abort(reason="already_configured")
-        # Offer options to add or ignore
+        # Offer options to add or ignore, once per device
+        await self.async_set_unique_id(serial)
         self._discovery_info = {
             CONF_HOST: host,
             CONF_USERNAME: DEFAULT_USERNAME,
@@ -203,6 +246,13 @@ class PiKVMConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         }
         return await self._show_zeroconf_menu()
 
+    @callback
+    def _async_set_discovered_addresses(self, entry, addresses: list[str]) -> None:
+        """Hand the announced addresses to the coordinator of a loaded entry."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
+        if coordinator is not None:
+            coordinator.async_set_discovered_addresses(addresses)
+
     async def _show_zeroconf_menu(self):
         """Show menu for ZeroConf discovered device."""
         return self.async_show_menu(
@@ -12,3 +12,46 @@ CONF_SERIAL = "serial"
 DEFAULT_USERNAME = "admin"
 DEFAULT_PASSWORD = "admin"
 MANUFACTURER = "PiKVM"
+
+CONF_SNAPSHOT_INTERVAL = "snapshot_interval"
+CONF_SNAPSHOT_RETENTION_DAYS = "snapshot_retention_days"
+CONF_SNAPSHOT_MAX_SIZE_MB = "snapshot_max_size_mb"
+DEFAULT_SNAPSHOT_INTERVAL = 0
+DEFAULT_SNAPSHOT_RETENTION_DAYS = 7
+DEFAULT_SNAPSHOT_MAX_SIZE_MB = 500
+SNAPSHOT_ARCHIVE_DIR = "pikvm_ha_snapshots"
+CONF_DEADBAND_CPU_TEMP = "deadband_cpu_temp"
+CONF_DEADBAND_CPU_UTILIZATION = "deadband_cpu_utilization"
+CONF_DEADBAND_MEMORY_UTILIZATION = "deadband_memory_utilization"
+CONF_DEADBAND_FAN_SPEED = "deadband_fan_speed"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_MAX_WRITE_SILENCE = "max_write_silence"
+DEFAULT_DEADBAND_CPU_TEMP = 0.5
+DEFAULT_DEADBAND_CPU_UTILIZATION = 2.0
+DEFAULT_DEADBAND_MEMORY_UTILIZATION = 1.0
+DEFAULT_DEADBAND_FAN_SPEED = 0.0
+DEFAULT_MIN_WRITE_INTERVAL = 0
+DEFAULT_MAX_WRITE_SILENCE = 600
+# Comma separated fallback addresses, e.g. a VPN address of the device
+CONF_ADDITIONAL_ADDRESSES = "additional_addresses"
+DEFAULT_ADDITIONAL_ADDRESSES = ""
+DATA_SNAPSHOT_ARCHIVE = f"{DOMAIN}_snapshot_archive"
+DATA_MSD_IMAGE_INDEX = f"{DOMAIN}_msd_image_index"
+DATA_SERIAL_INDEX = f"{DOMAIN}_serial_index"
+DATA_DISCOVERY_COALESCER = f"{DOMAIN}_discovery_coalescer"
+
+OPTIONS_DEFAULTS = {
+    CONF_SNAPSHOT_INTERVAL: DEFAULT_SNAPSHOT_INTERVAL,
+    CONF_SNAPSHOT_RETENTION_DAYS: DEFAULT_SNAPSHOT_RETENTION_DAYS,
+    CONF_SNAPSHOT_MAX_SIZE_MB: DEFAULT_SNAPSHOT_MAX_SIZE_MB,
+    CONF_DEADBAND_CPU_TEMP: DEFAULT_DEADBAND_CPU_TEMP,
+    CONF_DEADBAND_CPU_UTILIZATION: DEFAULT_DEADBAND_CPU_UTILIZATION,
+    CONF_DEADBAND_MEMORY_UTILIZATION: DEFAULT_DEADBAND_MEMORY_UTILIZATION,
+    CONF_DEADBAND_FAN_SPEED: DEFAULT_DEADBAND_FAN_SPEED,
+    CONF_MIN_WRITE_INTERVAL: DEFAULT_MIN_WRITE_INTERVAL,
+    CONF_MAX_WRITE_SILENCE: DEFAULT_MAX_WRITE_SILENCE,
+    CONF_ADDITIONAL_ADDRESSES: DEFAULT_ADDITIONAL_ADDRESSES,
+}
+
+# Streamer telemetry changes many times per second during a KVM session
+STREAMER_WRITE_INTERVAL = 1.0
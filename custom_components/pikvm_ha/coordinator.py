@@ -1,21 +1,27 @@
 """Manages fetching data from the PiKVM API."""
 
 import asyncio
+from collections.abc import Awaitable, Callable
 from datetime import timedelta
 import functools
 import logging
 import os
-import pyotp
+import time
+from urllib.parse import urlparse
 
-import requests
-from requests.auth import HTTPBasicAuth
+import aiohttp
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .cert_handler import create_session_with_cert  # Import the function
+from .address_race import address_url, async_race, is_usable_address
+from .cert_handler import create_session_with_cert, create_ssl_context
 from .const import DOMAIN
+from .health_history import HealthHistory
+from .snapshot import SnapshotSchema
+from .write_filter import WriteFilter
+from .utils import deep_merge, get_nested_value
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,10 +37,15 @@ class AuthenticationFailed(Exception):
     """Custom exception for authentication failures."""
 
 
+class PiKVMRequestError(Exception):
+    """Raised when a request to the PiKVM API fails."""
+
+
 class PiKVMDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the PiKVM API."""
 
     url: str = ""
+    configured_url: str = ""
     device_info: DeviceInfo | None = None
 
     def __init__(
@@ -42,16 +53,39 @@ class PiKVMDataUpdateCoordinator(DataUpdateCoordinator):
     ) -> None:
         """Initialize."""
         self.hass = hass
-        self.url = format_url(url)
-        self.username = username
-        self.password = password
-        self.totp = None
-        if len(totp) > 0:
-            self.totp = pyotp.TOTP(totp)
+        # Other addresses of the device, from the options and from zeroconf,
+        # raced against the configured URL when it stops answering
+        self.additional_addresses: list[str] = []
+        self.discovered_addresses: list[str] = []
+        self._set_credentials(url, username, password, totp)
         self.cert = cert
         self.session = None
         self.cert_file_path = None
         self.device_info = None
+        self.event_stream = None
+        # Latest state pushed by kvmd over the websocket, keyed by event name
+        # without the "_state" suffix (e.g. "atx", "hid").
+        self.push_state: dict[str, dict] = {}
+        self._event_listeners: dict[str, list[Callable[[], None]]] = {}
+        # Incremented with every pushed update, to invalidate per-update caches
+        self.push_generation = 0
+        self._client_session: aiohttp.ClientSession | None = None
+        self.msd_transfer = None
+        self.msd_transfer_task: asyncio.Task | None = None
+        self.health_history = HealthHistory()
+        # Paths read by the sensors, evaluated once per update into a snapshot
+        self.snapshot_schema = SnapshotSchema()
+        self._snapshot = None
+        self._snapshot_data = None
+        self._snapshot_version = -1
+        # Cleared once the device reports it has no KVM switch attached
+        self._switch_supported = True
+        # Replaced with one built from the entry options during setup
+        self.write_filter = WriteFilter()
+        # Set while the data is the cached state of a previous run
+        self.stale = False
+        # Stops the snapshot archiving of the entry, if enabled
+        self.snapshot_archive_stop: Callable[[], Awaitable[None]] | None = None
         super().__init__(
             hass,
             _LOGGER,
@@ -60,7 +94,127 @@ class PiKVMDataUpdateCoordinator(DataUpdateCoordinator):
         )
         # Create the session initially
         
+    @property
+    def snapshot(self):
+        """Return the flat snapshot of the current data, built once per update."""
+        if (
+            self._snapshot is None
+            or self._snapshot_data is not self.data
+            or self._snapshot_version != self.snapshot_schema.version
+        ):
+            self._snapshot = self.snapshot_schema.build(self.data)
+            self._snapshot_data = self.data
+            self._snapshot_version = self.snapshot_schema.version
+        return self._snapshot
+
+    @callback
+    def async_set_cached_data(self, data: dict) -> None:
+        """Start from the last known data until the first live update."""
+        self.data = data
+        self.stale = True
+        # The switch and GPIO entities read the pushed state, which the polled
+        # data of these endpoints seeds
+        if isinstance(get_nested_value(data, ["gpio", "state"]), dict):
+            self.push_state["gpio"] = data["gpio"]["state"]
+        if isinstance(data.get("switch"), dict):
+            self.push_state["switch"] = data["switch"]
+
+    def _set_credentials(self, url: str, username: str, password: str, totp: str) -> None:
+        self.configured_url = self.url = format_url(url)
+        self.username = username
+        self.password = password
+        self.totp = None
+        if len(totp) > 0:
+            import pyotp  # pylint: disable=import-outside-toplevel
+
+            self.totp = pyotp.TOTP(totp)
+
+    def connection_changed(
+        self, url: str, username: str, password: str, totp: str, cert: str
+    ) -> bool:
+        """Return whether any connection setting differs from the ones in use."""
+        return (
+            format_url(url) != self.configured_url
+            or username != self.username
+            or password != self.password
+            or totp != (self.totp.secret if self.totp else "")
+            or cert != self.cert
+        )
+
+    async def async_update_connection(
+        self, url: str, username: str, password: str, totp: str, cert: str
+    ) -> None:
+        """Switch the live coordinator to a new URL, credentials or certificate."""
+        cert_changed = cert != self.cert
+        self._set_credentials(url, username, password, totp)
+        self.cert = cert
+        await self._create_session()
+        # The websocket and streaming transfers pin the certificate per session
+        if cert_changed and self._client_session is not None:
+            await self._client_session.close()
+            self._client_session = None
+        await self._async_restart_event_stream()
+        await self.async_request_refresh()
+
+    def candidate_urls(self) -> list[str]:
+        """Return the base URLs the device may answer at, configured first."""
+        urls = [self.configured_url]
+        for address in (*self.additional_addresses, *self.discovered_addresses):
+            if "://" in address:
+                url = format_url(address)
+            else:
+                url = address_url(address, self.configured_url)
+            if url not in urls:
+                urls.append(url)
+        return urls
+
+    @callback
+    def async_set_discovered_addresses(self, addresses: list[str]) -> None:
+        """Remember the addresses the device was last announced at."""
+        usable = [
+            address.rstrip(".").lower()
+            for address in addresses
+            if is_usable_address(address.rstrip("."))
+        ]
+        if usable == self.discovered_addresses:
+            return
+        self.discovered_addresses = usable
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.async_select_address(),
+            f"{DOMAIN} select address {self.configured_url}",
+        )
+
+    async def async_select_address(self) -> bool:
+        """Switch to the candidate URL that connects first.
+
+        Returns whether the URL in use changed.
+        """
+        urls = self.candidate_urls()
+        if len(urls) < 2:
+            return False
+        targets = []
+        for url in urls:
+            parsed = urlparse(url)
+            default_port = 443 if parsed.scheme == "https" else 80
+            targets.append((parsed.hostname, parsed.port or default_port))
+        winner = await async_race(targets)
+        if winner is None or urls[winner] == self.url:
+            return False
+        _LOGGER.debug("Switching %s to %s", self.url, urls[winner])
+        self.url = urls[winner]
+        await self._async_restart_event_stream()
+        return True
+
+    async def _async_restart_event_stream(self) -> None:
+        """Reconnect the event stream to the URL in use."""
+        if self.event_stream is not None:
+            await self.event_stream.async_stop()
+            self.event_stream.async_start()
+
     def get_auth(self):
+        from requests.auth import HTTPBasicAuth  # pylint: disable=import-outside-toplevel
+
         auth = HTTPBasicAuth(self.username, self.password)
         totp = getattr(self, "totp", None)
         if totp:
@@ -84,8 +238,218 @@ class PiKVMDataUpdateCoordinator(DataUpdateCoordinator):
             self.session.auth = auth
             _LOGGER.debug("Session created successfully")
 
+    def get_client_auth(self) -> aiohttp.BasicAuth:
+        """Return the credentials for the aiohttp client session."""
+        auth = self.get_auth()
+        return aiohttp.BasicAuth(auth.username, auth.password)
+
+    async def async_get_client_session(self) -> aiohttp.ClientSession:
+        """Return an aiohttp session pinned to the device certificate.
+
+        Used for the websocket and for streaming transfers, which do not fit
+        the executor-based requests session.
+        """
+        if self._client_session is None or self._client_session.closed:
+            ssl_context = await create_ssl_context(self.hass, self.cert)
+            self._client_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(ssl=ssl_context)
+            )
+        return self._client_session
+
+    @callback
+    def async_add_event_listener(
+        self, event_type: str, update_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for pushed updates of a kvmd state."""
+        listeners = self._event_listeners.setdefault(event_type, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_handle_event(self, event_type: str, event: dict) -> None:
+        """Merge a state pushed by kvmd and notify the interested entities."""
+        name = event_type.removesuffix("_state")
+        self.push_state[name] = deep_merge(self.push_state.get(name, {}), event)
+        self.async_notify_event_listeners(name)
+
+    @callback
+    def async_notify_event_listeners(self, event_type: str) -> None:
+        """Notify the entities listening for an event."""
+        self.push_generation += 1
+        for update_callback in list(self._event_listeners.get(event_type, ())):
+            update_callback()
+
+    async def async_shutdown(self) -> None:
+        """Stop the event stream and close the client session."""
+        await super().async_shutdown()
+        if self.msd_transfer_task is not None:
+            self.msd_transfer_task.cancel()
+        if self.event_stream is not None:
+            await self.event_stream.async_stop()
+        if self._client_session is not None:
+            await self._client_session.close()
+            self._client_session = None
+
+    async def async_atx_power(self, action: str) -> None:
+        """Change the ATX power state ("on", "off", "off_hard" or "reset_hard")."""
+        await self.async_request("POST", "/api/atx/power", params={"action": action})
+
+    async def async_atx_click(self, button: str) -> None:
+        """Press an ATX button ("power", "power_long" or "reset")."""
+        await self.async_request("POST", "/api/atx/click", params={"button": button})
+
+    async def async_msd_remove_image(self, image: str) -> None:
+        """Remove an image from the MSD storage."""
+        await self.async_request("POST", "/api/msd/remove", params={"image": image})
+
+    async def async_msd_set_connected(self, connected: bool) -> None:
+        """Connect the MSD to the host, or disconnect it."""
+        await self.async_request(
+            "POST", "/api/msd/set_connected", params={"connected": int(connected)}
+        )
+
+    async def async_msd_set_image(self, image: str) -> None:
+        """Select the image presented by the MSD."""
+        await self.async_request("POST", "/api/msd/set_params", params={"image": image})
+
+    async def async_gpio_switch(self, channel: str, state: bool) -> None:
+        """Switch a GPIO output channel and publish the new state at once."""
+        await self.async_request(
+            "POST",
+            "/api/gpio/switch",
+            params={"channel": channel, "state": int(state), "wait": 0},
+        )
+        self.async_handle_event(
+            "gpio_state", {"outputs": {channel: {"state": state}}}
+        )
+
+    async def async_gpio_pulse(self, channel: str) -> None:
+        """Send a pulse on a GPIO output channel using its configured delay."""
+        await self.async_request(
+            "POST", "/api/gpio/pulse", params={"channel": channel, "wait": 0}
+        )
+
+    async def async_switch_set_active(self, port: int) -> None:
+        """Select the active port of the attached KVM switch."""
+        await self.async_request(
+            "POST", "/api/switch/set_active", params={"port": port}
+        )
+        self.async_handle_event("switch_state", {"summary": {"active_port": port}})
+
+    async def async_request(self, method: str, path: str, **kwargs):
+        """Send an authenticated request to the PiKVM API and return the response."""
+        if not self.session:
+            await self._create_session()
+        if not self.session:
+            raise PiKVMRequestError(f"No session available for {self.url}")
+
+        import requests  # pylint: disable=import-outside-toplevel
+
+        kwargs.setdefault("timeout", 5)
+        try:
+            response = await self.hass.async_add_executor_job(
+                functools.partial(
+                    self.session.request,
+                    method,
+                    f"{self.url}{path}",
+                    auth=self.get_auth(),
+                    **kwargs,
+                )
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            raise PiKVMRequestError(f"{method} {path} failed: {err}") from err
+        return response
+
+    async def async_fetch_snapshot(self) -> bytes:
+        """Fetch a JPEG snapshot of the current video frame."""
+        response = await self.async_request(
+            "GET",
+            "/api/streamer/snapshot",
+            params={"allow_offline": 1},
+            timeout=10,
+        )
+        return response.content
+
+    async def _async_fetch_gpio(self, auth):
+        """Fetch the GPIO model and the state of all channels in one request.
+
+        The channel state is also stored as the latest pushed "gpio" state, so
+        channel entities read a single shared copy whichever way it arrived.
+        A failed request keeps the previous GPIO data instead of failing the
+        whole update.
+        """
+        import requests  # pylint: disable=import-outside-toplevel
+
+        try:
+            response = await self.hass.async_add_executor_job(
+                functools.partial(
+                    self.session.get,
+                    f"{self.url}/api/gpio",
+                    auth=auth,
+                    timeout=5,
+                )
+            )
+            if not response.ok:
+                # Older kvmd versions or a broken GPIO config must not fail the update
+                _LOGGER.debug(
+                    "GPIO unavailable at %s: HTTP %s", self.url, response.status_code
+                )
+                return None
+            data_gpio = response.json().get("result") or {}
+        except (requests.exceptions.RequestException, ValueError) as err:
+            _LOGGER.debug("GPIO request to %s failed: %s", self.url, err)
+            return get_nested_value(self.data, ["gpio"])
+        if isinstance(data_gpio.get("state"), dict):
+            self.push_state["gpio"] = data_gpio["state"]
+            self.async_notify_event_listeners("gpio")
+        return data_gpio
+
+    async def _async_fetch_switch(self, auth):
+        """Fetch the model and state of all ports of the KVM switch in one request.
+
+        Devices without a switch answer 404 once and are not asked again. A
+        failed request keeps the previous switch data instead of failing the
+        whole update.
+        """
+        import requests  # pylint: disable=import-outside-toplevel
+
+        if not self._switch_supported:
+            return None
+        try:
+            response = await self.hass.async_add_executor_job(
+                functools.partial(
+                    self.session.get,
+                    f"{self.url}/api/switch",
+                    auth=auth,
+                    timeout=5,
+                )
+            )
+            if response.status_code == 404:
+                self._switch_supported = False
+                return None
+            if not response.ok:
+                _LOGGER.debug(
+                    "Switch unavailable at %s: HTTP %s", self.url, response.status_code
+                )
+                return None
+            data_switch = response.json().get("result") or {}
+        except (requests.exceptions.RequestException, ValueError) as err:
+            _LOGGER.debug("Switch request to %s failed: %s", self.url, err)
+            return get_nested_value(self.data, ["switch"])
+        self.push_state["switch"] = data_switch
+        self.async_notify_event_listeners("switch")
+        return data_switch
+
     async def _async_update_data(self):
         """Fetch data from PiKVM API."""
+        import requests  # pylint: disable=import-outside-toplevel
+
         max_retries = 3
         backoff_time = 1  # Initial backoff time in seconds
         retries = 0
@@ -93,7 +457,7 @@ class PiKVMDataUpdateCoordinator(DataUpdateCoordinator):
         while retries < max_retries:
             try:
                 auth = self.get_auth()
-                _LOGGER.debug("Fetching PiKVM Info & MSD at %s", self.url)
+                _LOGGER.debug("Fetching PiKVM Info, MSD, GPIO & switch at %s", self.url)
 
                 if not self.session:
                     await self._create_session()
@@ -133,7 +497,11 @@ class PiKVMDataUpdateCoordinator(DataUpdateCoordinator):
                     return None
 
                 data_info["msd"] = data_msd
+                data_info["gpio"] = await self._async_fetch_gpio(auth)
+                data_info["switch"] = await self._async_fetch_switch(auth)
                 _LOGGER.debug("Received PiKVM Info & MSD from %s", self.url)
+                self.health_history.add_sample(time.monotonic(), data_info)
+                self.stale = False
 
                 return data_info  # noqa: TRY300
             except AuthenticationFailed as auth_err:
@@ -141,7 +509,13 @@ class PiKVMDataUpdateCoordinator(DataUpdateCoordinator):
                 raise UpdateFailed(f"Authentication failed: {auth_err}") from auth_err
             except requests.exceptions.RequestException as err:
                 retries += 1
-                if retries < max_retries:
+                if retries < max_retries and await self.async_select_address():
+                    _LOGGER.debug(
+                        "Error communicating with API: %s. Failed over to %s",
+                        err,
+                        self.url,
+                    )
+                elif retries < max_retries:
                     _LOGGER.debug(
                         "Error communicating with API: %s. Retrying in %s seconds",
                         err,
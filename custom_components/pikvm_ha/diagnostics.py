@@ -30,6 +30,8 @@ async def async_get_config_entry_diagnostics(
             "update_interval": str(coordinator.update_interval)
             if coordinator
             else None,
+            "stale": coordinator.stale,
+            "writes": coordinator.write_filter.counts,
             "states": _mask_sensitive_data(_expand_mapping_proxy(coordinator.data))
             if coordinator
             else {},
@@ -0,0 +1,129 @@
+"""Coalescing of repeated discoveries of configured PiKVMs.
+
+A PiKVM re-announces itself often, and once per network interface. Each
+announcement of a configured serial used to rewrite the host of its entry,
+which flip-flops between the addresses of a multi-homed device. Announcements
+are now handled on the leading edge: the first one of a serial is applied at
+once, later ones within DISCOVERY_WINDOW are coalesced and only the latest is
+applied when the window closes. An announcement that still lists the
+configured host among its addresses is not a move and changes nothing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+import functools
+import time
+from urllib.parse import urlparse
+
+from homeassistant.config_entries import ConfigEntry, UnknownEntry
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONF_ADDITIONAL_ADDRESSES,
+    CONF_HOST,
+    DATA_DISCOVERY_COALESCER,
+    DEFAULT_ADDITIONAL_ADDRESSES,
+)
+from .utils import format_url, parse_addresses
+
+DISCOVERY_WINDOW = 60
+
+
+def host_moved(entry: ConfigEntry, host: str, addresses: Iterable[str]) -> bool:
+    """Return whether a device announced at host no longer has the entry's host.
+
+    addresses holds every address and hostname the device was announced with.
+    """
+    configured = entry.data.get(CONF_HOST)
+    if not configured:
+        return True
+    configured_host = urlparse(format_url(configured)).hostname
+    announced = {host, *addresses}
+    return configured_host not in {name.rstrip(".").lower() for name in announced}
+
+
+async def async_resolve_entry_addresses(entry: ConfigEntry) -> set[str]:
+    """Return the IP addresses the host and additional addresses of entry resolve to.
+
+    A scan only knows the IP address a device answered at; this tells whether
+    that is one of the addresses the entry already reaches it by.
+    """
+    addresses = parse_addresses(
+        entry.options.get(CONF_ADDITIONAL_ADDRESSES, DEFAULT_ADDITIONAL_ADDRESSES)
+    )
+    if entry.data.get(CONF_HOST):
+        addresses.insert(0, entry.data[CONF_HOST])
+    loop = asyncio.get_running_loop()
+    resolved: set[str] = set()
+    for address in addresses:
+        hostname = urlparse(format_url(address)).hostname
+        if not hostname:
+            continue
+        try:
+            infos = await loop.getaddrinfo(hostname, None)
+        except OSError:
+            continue
+        resolved.update(info[4][0] for info in infos)
+    return resolved
+
+
+class DiscoveryCoalescer:
+    """Apply at most one discovery per serial and window."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coalescer."""
+        self.hass = hass
+        self._applied_at: dict[str, float] = {}
+        self._pending: dict[str, Callable[[], None]] = {}
+        self._unsub_flush: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_discovered(self, serial: str, apply: Callable[[], None]) -> bool:
+        """Run apply for a discovered serial now or when its window closes.
+
+        Returns whether apply ran right away.
+        """
+        now = time.monotonic()
+        applied_at = self._applied_at.get(serial)
+        if applied_at is None or now - applied_at >= DISCOVERY_WINDOW:
+            self._applied_at[serial] = now
+            apply()
+            return True
+
+        # Only the latest announcement of the window matters
+        self._pending[serial] = apply
+        if serial not in self._unsub_flush:
+            self._unsub_flush[serial] = async_call_later(
+                self.hass,
+                applied_at + DISCOVERY_WINDOW - now,
+                HassJob(
+                    functools.partial(self._async_flush, serial),
+                    cancel_on_shutdown=True,
+                ),
+            )
+        return False
+
+    @callback
+    def _async_flush(self, serial: str, _now) -> None:
+        self._unsub_flush.pop(serial, None)
+        apply = self._pending.pop(serial, None)
+        if apply is None:
+            return
+        self._applied_at[serial] = time.monotonic()
+        try:
+            apply()
+        except UnknownEntry:
+            # The entry was removed while the window was open
+            pass
+
+
+@callback
+def async_get_discovery_coalescer(hass: HomeAssistant) -> DiscoveryCoalescer:
+    """Return the discovery coalescer, creating it on first use."""
+    coalescer = hass.data.get(DATA_DISCOVERY_COALESCER)
+    if coalescer is None:
+        coalescer = hass.data[DATA_DISCOVERY_COALESCER] = DiscoveryCoalescer(hass)
+    return coalescer
@@ -1,11 +1,16 @@
 """PiKVM entity base class."""
 
 import logging
+import time
 
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinator import PiKVMDataUpdateCoordinator
+from .kvm_switch import get_port_state, get_ports, port_event
+from .utils import get_nested_value
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,6 +20,11 @@ class PiKVMEntity(CoordinatorEntity):
 
     coordinator: PiKVMDataUpdateCoordinator
 
+    # kvmd states (e.g. "atx") whose pushed updates refresh this entity
+    _push_events: tuple[str, ...] = ()
+    # Minimum seconds between state writes caused by pushes; 0 writes every push
+    _push_min_interval: float = 0
+
     def __init__(
         self, coordinator: PiKVMDataUpdateCoordinator, unique_id_base: str
     ) -> None:
@@ -23,3 +33,123 @@ class PiKVMEntity(CoordinatorEntity):
         self.coordinator = coordinator
         self._attr_device_info = coordinator.device_info
         self._attr_unique_id_base = unique_id_base
+        self._last_push_write = 0.0
+        self._unsub_push_write = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to coordinator updates and pushed kvmd events."""
+        await super().async_added_to_hass()
+        for event_type in self._push_events:
+            self.async_on_remove(
+                self.coordinator.async_add_event_listener(
+                    event_type, self._handle_push_update
+                )
+            )
+        self.async_on_remove(self._async_cancel_push_write)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_write_update()
+
+    @callback
+    def _async_write_update(self) -> None:
+        """Write the state after an update; entities may skip redundant writes."""
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_push_update(self) -> None:
+        """Handle a state pushed by kvmd.
+
+        With a minimum interval, pushes arriving too soon after the last write
+        are coalesced into one deferred write carrying the latest state.
+        """
+        if not self._push_min_interval:
+            self._async_write_update()
+            return
+        if self._unsub_push_write is not None:
+            return
+        delay = self._last_push_write + self._push_min_interval - time.monotonic()
+        if delay <= 0:
+            self._async_write_push_state()
+        else:
+            self._unsub_push_write = async_call_later(
+                self.hass, delay, self._async_write_push_state
+            )
+
+    @callback
+    def _async_write_push_state(self, _now=None) -> None:
+        self._unsub_push_write = None
+        self._last_push_write = time.monotonic()
+        self._async_write_update()
+
+    @callback
+    def _async_cancel_push_write(self) -> None:
+        if self._unsub_push_write is not None:
+            self._unsub_push_write()
+            self._unsub_push_write = None
+
+
+class PiKVMGpioEntity(PiKVMEntity):
+    """Base class for an entity bound to one GPIO channel.
+
+    All channel entities read the shared "gpio" state, which is refreshed by
+    a single /api/gpio request per update and by gpio_state pushes.
+    """
+
+    _push_events = ("gpio",)
+
+    def __init__(
+        self,
+        coordinator: PiKVMDataUpdateCoordinator,
+        unique_id_base: str,
+        device_name: str,
+        direction: str,
+        channel: str,
+    ) -> None:
+        """Initialize the entity for an "inputs" or "outputs" channel."""
+        super().__init__(coordinator, unique_id_base)
+        self._direction = direction
+        self._channel = channel
+        self._attr_name = f"{device_name} GPIO {channel}"
+
+    @property
+    def _channel_state(self) -> dict:
+        return get_nested_value(
+            self.coordinator.push_state, ["gpio", self._direction, self._channel], {}
+        ) or {}
+
+    @property
+    def available(self) -> bool:
+        """Return True while the channel's driver reports it online."""
+        return super().available and self._channel_state.get("online", False)
+
+
+class PiKVMSwitchPortEntity(PiKVMEntity):
+    """Base class for an entity bound to one port of the attached KVM switch.
+
+    Only the ports whose state changed are notified, see KVMSwitchDispatcher.
+    """
+
+    def __init__(
+        self,
+        coordinator: PiKVMDataUpdateCoordinator,
+        unique_id_base: str,
+        device_name: str,
+        port: int,
+        label: str,
+    ) -> None:
+        """Initialize the entity for a zero-based port index."""
+        super().__init__(coordinator, unique_id_base)
+        self._port = port
+        self._push_events = (port_event(port),)
+        self._attr_name = f"{device_name} Port {label}"
+
+    @property
+    def _port_state(self) -> dict:
+        return get_port_state(self.coordinator, self._port)
+
+    @property
+    def available(self) -> bool:
+        """Return True while the switch reports this port."""
+        return super().available and self._port < len(get_ports(self.coordinator))
@@ -0,0 +1,96 @@
+"""Index of the PiKVM config entries by device serial.
+
+Zeroconf announces every PiKVM repeatedly, and each announcement, like every
+config and options flow, has to find the entry of a serial. Instead of
+scanning all entries each time, the entries are indexed once and the index
+follows SIGNAL_CONFIG_ENTRY_CHANGED as entries are added, updated or removed.
+"""
+
+from __future__ import annotations
+
+from homeassistant.config_entries import (
+    SIGNAL_CONFIG_ENTRY_CHANGED,
+    SOURCE_IGNORE,
+    ConfigEntry,
+    ConfigEntryChange,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import CONF_SERIAL, DATA_SERIAL_INDEX, DOMAIN
+
+
+def normalize_serial(serial: str) -> str:
+    """Return the form serials are compared in."""
+    return serial.strip().lower()
+
+
+def _entry_serials(entry: ConfigEntry) -> set[str]:
+    """Return the serials an entry is known by.
+
+    The serial stored with the entry data is used by discovery, the unique ID
+    by the flows. Ignored discoveries only block new flows for their unique
+    ID and are not returned as existing entries.
+    """
+    if entry.source == SOURCE_IGNORE:
+        return set()
+    return {
+        normalize_serial(serial)
+        for serial in (entry.data.get(CONF_SERIAL), entry.unique_id)
+        if serial
+    }
+
+
+class SerialIndex:
+    """Config entries of the domain keyed by normalized serial."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Index the current entries and follow later changes."""
+        self.hass = hass
+        self._entry_ids: dict[str, str] = {}
+        self._serials: dict[str, set[str]] = {}
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            self._async_add(entry)
+        async_dispatcher_connect(
+            hass, SIGNAL_CONFIG_ENTRY_CHANGED, self._async_entry_changed
+        )
+
+    @callback
+    def _async_entry_changed(self, change: ConfigEntryChange, entry: ConfigEntry) -> None:
+        if entry.domain != DOMAIN:
+            return
+        self._async_remove(entry.entry_id)
+        if change is not ConfigEntryChange.REMOVED:
+            self._async_add(entry)
+
+    @callback
+    def _async_add(self, entry: ConfigEntry) -> None:
+        serials = _entry_serials(entry)
+        self._serials[entry.entry_id] = serials
+        for serial in serials:
+            self._entry_ids[serial] = entry.entry_id
+
+    @callback
+    def _async_remove(self, entry_id: str) -> None:
+        for serial in self._serials.pop(entry_id, ()):
+            if self._entry_ids.get(serial) == entry_id:
+                del self._entry_ids[serial]
+
+    @callback
+    def async_get_entry(self, serial: str | None) -> ConfigEntry | None:
+        """Return the config entry of a serial, if it is configured."""
+        if not serial:
+            return None
+        entry_id = self._entry_ids.get(normalize_serial(serial))
+        if entry_id is None:
+            return None
+        return self.hass.config_entries.async_get_entry(entry_id)
+
+
+@callback
+def async_get_serial_index(hass: HomeAssistant) -> SerialIndex:
+    """Return the serial index, creating it on first use."""
+    index = hass.data.get(DATA_SERIAL_INDEX)
+    if index is None:
+        index = hass.data[DATA_SERIAL_INDEX] = SerialIndex(hass)
+    return index
@@ -0,0 +1,123 @@
+"""Bounded in-memory history of PiKVM health samples with rolling statistics.
+
+Every series is a fixed-size ring of doubles, so a device costs the same few
+kilobytes whether it has been up for an hour or a month. Statistics over the
+window are maintained incrementally as samples arrive:
+
+* mean: a running sum, adjusted for the sample that falls out of the window;
+* min/max: monotonic queues of sample positions (amortized O(1) per sample);
+* rate of change: newest minus oldest sample over their time difference.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+
+from .utils import get_nested_value
+
+DEFAULT_CAPACITY = 720  # 6 hours at the 30 second update interval
+
+# Metric name -> path in the coordinator data
+HEALTH_METRICS = {
+    "cpu_temp": ["hw", "health", "temp", "cpu"],
+    "cpu_percent": ["hw", "health", "cpu", "percent"],
+    "mem_percent": ["hw", "health", "mem", "percent"],
+}
+
+
+class RollingSeries:
+    """Fixed-size ring of (timestamp, value) samples with O(1) statistics."""
+
+    __slots__ = ("capacity", "_times", "_values", "_count", "_sum", "_min", "_max")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize an empty series holding at most capacity samples."""
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        # Total samples ever added; sample n lives at slot n % capacity
+        self._count = 0
+        self._sum = 0.0
+        # Sample numbers whose values increase (min) or decrease (max)
+        self._min: deque[int] = deque()
+        self._max: deque[int] = deque()
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return min(self._count, self.capacity)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample, evicting the oldest one once the ring is full."""
+        number = self._count
+        slot = number % self.capacity
+        if number >= self.capacity:
+            self._sum -= self._values[slot]
+            oldest = number - self.capacity
+            if self._min[0] == oldest:
+                self._min.popleft()
+            if self._max[0] == oldest:
+                self._max.popleft()
+
+        self._times[slot] = timestamp
+        self._values[slot] = value
+        self._sum += value
+        self._count = number + 1
+
+        while self._min and self._value(self._min[-1]) >= value:
+            self._min.pop()
+        self._min.append(number)
+        while self._max and self._value(self._max[-1]) <= value:
+            self._max.pop()
+        self._max.append(number)
+
+    def _value(self, number: int) -> float:
+        return self._values[number % self.capacity]
+
+    def stats(self) -> dict[str, float] | None:
+        """Return min, mean, max and rate of change per minute over the window."""
+        size = len(self)
+        if not size:
+            return None
+        newest = (self._count - 1) % self.capacity
+        oldest = (self._count - size) % self.capacity
+        elapsed = self._times[newest] - self._times[oldest]
+        rate = 0.0
+        if elapsed > 0:
+            rate = (self._values[newest] - self._values[oldest]) / elapsed * 60
+        return {
+            "min": self._value(self._min[0]),
+            "mean": self._sum / size,
+            "max": self._value(self._max[0]),
+            "rate_per_min": rate,
+        }
+
+
+class HealthHistory:
+    """Rolling history of the health metrics of one device."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize an empty history for every metric."""
+        self.series = {
+            metric: RollingSeries(capacity) for metric in (*HEALTH_METRICS, "fan")
+        }
+
+    def add_sample(self, timestamp: float, data: dict | None) -> None:
+        """Record the metrics present in a coordinator update."""
+        for metric, keys in HEALTH_METRICS.items():
+            self._add(metric, timestamp, get_nested_value(data, keys))
+        fan_state = get_nested_value(data, ["fan", "state"], {})
+        if get_nested_value(fan_state, ["hall", "available"], False):
+            self._add("fan", timestamp, get_nested_value(fan_state, ["hall", "rpm"]))
+        else:
+            self._add("fan", timestamp, get_nested_value(fan_state, ["fan", "speed"]))
+
+    def _add(self, metric: str, timestamp: float, value) -> None:
+        try:
+            self.series[metric].add(timestamp, float(value))
+        except (TypeError, ValueError):
+            return
+
+    def stats(self, metric: str) -> dict[str, float] | None:
+        """Return the rolling statistics of a metric."""
+        return self.series[metric].stats()
@@ -0,0 +1,175 @@
+"""Keyboard input for the host attached to a PiKVM.
+
+Keys are sent as kvmd "key" events over the coordinator's websocket, so a
+whole string is typed over one connection. If the websocket is down, text is
+handed to kvmd's ``/api/hid/print`` in a single request instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import string
+from typing import TYPE_CHECKING
+
+from .utils import get_nested_value
+
+if TYPE_CHECKING:
+    from .coordinator import PiKVMDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_KEY_DELAY = 0.01
+MIN_KEY_DELAY = 0.002
+HID_BUSY_TIMEOUT = 5
+
+SHIFT_KEY = "ShiftLeft"
+
+# US layout: character -> (kvmd key code, shift pressed)
+_SPECIAL_KEYS: dict[str, tuple[str, bool]] = {
+    " ": ("Space", False),
+    "\n": ("Enter", False),
+    "\t": ("Tab", False),
+    "-": ("Minus", False),
+    "_": ("Minus", True),
+    "=": ("Equal", False),
+    "+": ("Equal", True),
+    "[": ("BracketLeft", False),
+    "{": ("BracketLeft", True),
+    "]": ("BracketRight", False),
+    "}": ("BracketRight", True),
+    "\\": ("Backslash", False),
+    "|": ("Backslash", True),
+    ";": ("Semicolon", False),
+    ":": ("Semicolon", True),
+    "'": ("Quote", False),
+    '"': ("Quote", True),
+    "`": ("Backquote", False),
+    "~": ("Backquote", True),
+    ",": ("Comma", False),
+    "<": ("Comma", True),
+    ".": ("Period", False),
+    ">": ("Period", True),
+    "/": ("Slash", False),
+    "?": ("Slash", True),
+}
+_SHIFTED_DIGITS = ")!@#$%^&*("
+
+
+def _build_keymap() -> dict[str, tuple[str, bool]]:
+    keymap = dict(_SPECIAL_KEYS)
+    for letter in string.ascii_lowercase:
+        keymap[letter] = (f"Key{letter.upper()}", False)
+        keymap[letter.upper()] = (f"Key{letter.upper()}", True)
+    for digit, shifted in zip(string.digits, _SHIFTED_DIGITS):
+        keymap[digit] = (f"Digit{digit}", False)
+        keymap[shifted] = (f"Digit{digit}", True)
+    return keymap
+
+
+KEYMAP = _build_keymap()
+
+
+def text_to_key_events(text: str) -> list[tuple[str, bool]]:
+    """Translate text into a list of (key, pressed) events.
+
+    Shift is held across runs of shifted characters instead of being pressed
+    and released around each one.
+
+    :raises ValueError: If the text contains a character with no key.
+    """
+    events: list[tuple[str, bool]] = []
+    shift_down = False
+    for char in text:
+        try:
+            key, shifted = KEYMAP[char]
+        except KeyError as err:
+            raise ValueError(f"Cannot type character {char!r}") from err
+        if shifted != shift_down:
+            events.append((SHIFT_KEY, shifted))
+            shift_down = shifted
+        events.append((key, True))
+        events.append((key, False))
+    if shift_down:
+        events.append((SHIFT_KEY, False))
+    return events
+
+
+def combo_to_key_events(combo: str) -> list[tuple[str, bool]]:
+    """Translate a combo such as "ControlLeft+AltLeft+Delete" into key events.
+
+    Keys are pressed in order and released in reverse order.
+    """
+    keys = [key.strip() for key in combo.split("+") if key.strip()]
+    if not keys:
+        raise ValueError(f"Empty key combination {combo!r}")
+    return [(key, True) for key in keys] + [(key, False) for key in reversed(keys)]
+
+
+async def _async_wait_until_idle(coordinator: PiKVMDataUpdateCoordinator) -> None:
+    """Wait while kvmd reports its HID queue as busy."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + HID_BUSY_TIMEOUT
+    while get_nested_value(coordinator.push_state, ["hid", "busy"], False):
+        if loop.time() > deadline:
+            raise TimeoutError("PiKVM HID stayed busy")
+        await asyncio.sleep(MIN_KEY_DELAY)
+
+
+def _check_keyboard_online(coordinator: PiKVMDataUpdateCoordinator) -> None:
+    online = get_nested_value(coordinator.push_state, ["hid", "keyboard", "online"])
+    if online is False:
+        raise ConnectionError("The PiKVM keyboard is offline")
+
+
+async def async_send_key_events(
+    coordinator: PiKVMDataUpdateCoordinator,
+    events: list[tuple[str, bool]],
+    delay: float = DEFAULT_KEY_DELAY,
+) -> None:
+    """Send key events over the event stream, pausing after each key release.
+
+    Keys still held when sending fails are released, so an interrupted combo
+    does not leave a modifier stuck on the host.
+    """
+    stream = coordinator.event_stream
+    if stream is None:
+        raise ConnectionError("The PiKVM event stream is not running")
+    _check_keyboard_online(coordinator)
+    delay = max(delay, MIN_KEY_DELAY)
+    held: list[str] = []
+    try:
+        for key, pressed in events:
+            if pressed:
+                held.append(key)
+            await stream.async_send("key", {"key": key, "state": pressed})
+            if not pressed:
+                if key in held:
+                    held.remove(key)
+                await asyncio.sleep(delay)
+                await _async_wait_until_idle(coordinator)
+    finally:
+        for key in reversed(held):
+            with contextlib.suppress(ConnectionError):
+                await stream.async_send("key", {"key": key, "state": False})
+
+
+async def async_type_text(
+    coordinator: PiKVMDataUpdateCoordinator,
+    text: str,
+    delay: float = DEFAULT_KEY_DELAY,
+) -> None:
+    """Type text on the attached host."""
+    events = text_to_key_events(text)
+    if coordinator.event_stream is None or not coordinator.event_stream.connected:
+        _LOGGER.debug("Event stream down, typing through /api/hid/print")
+        await coordinator.async_request(
+            "POST",
+            "/api/hid/print",
+            params={"limit": 0},
+            data=text.encode("utf-8"),
+            timeout=max(10, len(events) * delay * 2),
+        )
+        return
+    await async_send_key_events(coordinator, events, delay)
@@ -0,0 +1,95 @@
+"""Multiport KVM switch (PiKVM Switch) state shared by the per-port entities.
+
+A switch with 32 ports has around a hundred port entities. Instead of having
+every one of them refresh on each switch_state push, a single dispatcher
+compares each port with the previous update and only notifies the ports that
+actually changed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .utils import get_nested_value
+
+if TYPE_CHECKING:
+    from .coordinator import PiKVMDataUpdateCoordinator
+
+SWITCH_EVENT = "switch"
+ACTIVE_PORT_EVENT = "switch_active"
+
+
+def port_event(port: int) -> str:
+    """Return the event notified when the state of a port changes."""
+    return f"switch_port_{port}"
+
+
+def get_ports(coordinator: PiKVMDataUpdateCoordinator) -> list[dict]:
+    """Return the port models of the switch, empty if there is none."""
+    return get_nested_value(
+        coordinator.push_state, [SWITCH_EVENT, "model", "ports"], []
+    ) or []
+
+
+def get_port_label(ports: list[dict], port: int) -> str:
+    """Return the label of a port: its number, followed by its name if set."""
+    name = ports[port].get("name") if port < len(ports) else None
+    return f"{port + 1}: {name}" if name else str(port + 1)
+
+
+def get_active_port(coordinator: PiKVMDataUpdateCoordinator) -> int | None:
+    """Return the index of the active port, or None if no port is active."""
+    port = get_nested_value(
+        coordinator.push_state, [SWITCH_EVENT, "summary", "active_port"]
+    )
+    return port if isinstance(port, int) and port >= 0 else None
+
+
+def _get_port_flag(state: dict, keys: list[str], port: int) -> bool | None:
+    values = get_nested_value(state, keys)
+    if isinstance(values, list) and port < len(values):
+        return values[port]
+    return None
+
+
+def get_port_state(coordinator: PiKVMDataUpdateCoordinator, port: int) -> dict:
+    """Return the active, signal and power state of a port."""
+    state = coordinator.push_state.get(SWITCH_EVENT, {})
+    return {
+        "active": get_active_port(coordinator) == port,
+        "signal": _get_port_flag(state, ["video", "links"], port),
+        "power": _get_port_flag(state, ["atx", "leds", "power"], port),
+    }
+
+
+class KVMSwitchDispatcher:
+    """Turn switch state updates into per-port notifications."""
+
+    def __init__(self, coordinator: PiKVMDataUpdateCoordinator) -> None:
+        """Initialize the dispatcher."""
+        self.coordinator = coordinator
+        self._active_port: int | None = None
+        self._port_states: dict[int, dict] = {}
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start dispatching and return the function that stops it."""
+        return self.coordinator.async_add_event_listener(
+            SWITCH_EVENT, self._async_handle_update
+        )
+
+    @callback
+    def _async_handle_update(self) -> None:
+        coordinator = self.coordinator
+        active_port = get_active_port(coordinator)
+        if active_port != self._active_port:
+            self._active_port = active_port
+            coordinator.async_notify_event_listeners(ACTIVE_PORT_EVENT)
+
+        for port in range(len(get_ports(coordinator))):
+            port_state = get_port_state(coordinator, port)
+            if self._port_states.get(port) != port_state:
+                self._port_states[port] = port_state
+                coordinator.async_notify_event_listeners(port_event(port))
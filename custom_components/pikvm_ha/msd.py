@@ -0,0 +1,411 @@
+"""Mass storage drive (MSD) image transfers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable
+import contextlib
+from dataclasses import dataclass, field
+import json
+import logging
+import os
+import time
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+
+from .coordinator import PiKVMRequestError
+from .utils import get_nested_value
+
+if TYPE_CHECKING:
+    from .coordinator import PiKVMDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+MSD_TRANSFER_EVENT = "msd_transfer"
+PROGRESS_INTERVAL = 1.0
+# Chunks buffered per device; bounds memory to CHUNK_SIZE * depth * devices
+FANOUT_QUEUE_DEPTH = 4
+
+
+@dataclass
+class MSDTransfer:
+    """Progress of an image transfer to a PiKVM."""
+
+    image: str
+    total: int
+    sent: int = 0
+    status: str = "running"
+    error: str | None = None
+    started: float = field(default_factory=time.monotonic)
+    finished: float | None = None
+    _last_report: float = 0.0
+
+    @property
+    def percent(self) -> float | None:
+        """Return the completed percentage."""
+        if not self.total:
+            return None
+        return round(self.sent / self.total * 100, 1)
+
+    @property
+    def throughput(self) -> float:
+        """Return the average throughput in bytes per second."""
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return self.sent / elapsed if elapsed > 0 else 0.0
+
+    def should_report(self) -> bool:
+        """Return True if enough time passed since the last progress update."""
+        now = time.monotonic()
+        if now - self._last_report < PROGRESS_INTERVAL:
+            return False
+        self._last_report = now
+        return True
+
+
+class BandwidthLimiter:
+    """Pace byte streams to a maximum rate.
+
+    A single limiter can be shared by several concurrent transfers to cap
+    their combined bandwidth.
+    """
+
+    def __init__(self, rate: float | None) -> None:
+        """Initialize the limiter with a rate in bytes per second (None = unlimited)."""
+        self.rate = rate
+        self._next_send = 0.0
+
+    async def async_consume(self, amount: int) -> None:
+        """Wait until amount bytes may be sent."""
+        if not self.rate:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_send)
+        self._next_send = start + amount / self.rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def async_iter_file(
+    hass: HomeAssistant, path: str, chunk_size: int = CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Read a file in chunks from the executor without loading it into memory."""
+    file = await hass.async_add_executor_job(open, path, "rb")
+    try:
+        while chunk := await hass.async_add_executor_job(file.read, chunk_size):
+            yield chunk
+    finally:
+        await hass.async_add_executor_job(file.close)
+
+
+async def async_get_file_size(hass: HomeAssistant, path: str) -> int:
+    """Return the size of a file."""
+    return (await hass.async_add_executor_job(os.stat, path)).st_size
+
+
+async def async_upload_image(
+    coordinator: PiKVMDataUpdateCoordinator,
+    chunks: AsyncIterator[bytes],
+    image: str,
+    size: int,
+    limiter: BandwidthLimiter | None = None,
+) -> MSDTransfer:
+    """Stream an image to the PiKVM MSD storage and track its progress."""
+    transfer = MSDTransfer(image=image, total=size)
+    coordinator.msd_transfer = transfer
+    coordinator.async_notify_event_listeners(MSD_TRANSFER_EVENT)
+
+    async def _body() -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            if limiter is not None:
+                await limiter.async_consume(len(chunk))
+            yield chunk
+            transfer.sent += len(chunk)
+            if transfer.should_report():
+                coordinator.async_notify_event_listeners(MSD_TRANSFER_EVENT)
+
+    try:
+        session = await coordinator.async_get_client_session()
+        async with session.post(
+            f"{coordinator.url}/api/msd/write",
+            params={"image": image, "remove_incomplete": 1},
+            data=_body(),
+            headers={"Content-Length": str(size)},
+            auth=coordinator.get_client_auth(),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=10),
+        ) as response:
+            response.raise_for_status()
+    except asyncio.CancelledError:
+        transfer.status = "cancelled"
+        raise
+    except (aiohttp.ClientError, OSError) as err:
+        transfer.status = "failed"
+        transfer.error = str(err)
+        raise PiKVMRequestError(f"Upload of {image} failed: {err}") from err
+    else:
+        transfer.status = "completed"
+    finally:
+        transfer.finished = time.monotonic()
+        coordinator.async_notify_event_listeners(MSD_TRANSFER_EVENT)
+
+    _LOGGER.debug(
+        "Uploaded %s to %s at %.1f MB/s",
+        image,
+        coordinator.url,
+        transfer.throughput / (1024 * 1024),
+    )
+    return transfer
+
+
+async def async_run_transfer(
+    coordinator: PiKVMDataUpdateCoordinator, transfer: Awaitable[MSDTransfer]
+) -> MSDTransfer:
+    """Run a transfer as the coordinator's cancellable MSD task."""
+    if coordinator.msd_transfer_task is not None:
+        if asyncio.iscoroutine(transfer):
+            transfer.close()
+        raise PiKVMRequestError(f"An MSD transfer to {coordinator.url} is already running")
+    task = coordinator.hass.async_create_task(transfer)
+    coordinator.msd_transfer_task = task
+    try:
+        return await task
+    finally:
+        coordinator.msd_transfer_task = None
+
+
+async def async_download_remote(
+    coordinator: PiKVMDataUpdateCoordinator,
+    url: str,
+    image: str,
+    remote_timeout: int,
+) -> MSDTransfer:
+    """Have the PiKVM download an image from a URL into its MSD storage.
+
+    Progress is taken from the msd_state events kvmd pushes while it writes
+    the image, so nothing is polled and no image data passes through Home
+    Assistant.
+    """
+    transfer = MSDTransfer(image=image, total=0)
+    coordinator.msd_transfer = transfer
+    coordinator.async_notify_event_listeners(MSD_TRANSFER_EVENT)
+
+    @callback
+    def _handle_msd_state() -> None:
+        uploading = get_nested_value(
+            coordinator.push_state, ["msd", "storage", "uploading"]
+        )
+        if not isinstance(uploading, dict) or uploading.get("name") != image:
+            return
+        transfer.total = uploading.get("size") or transfer.total
+        transfer.sent = uploading.get("written") or transfer.sent
+        if transfer.should_report():
+            coordinator.async_notify_event_listeners(MSD_TRANSFER_EVENT)
+
+    unsub = coordinator.async_add_event_listener("msd", _handle_msd_state)
+    try:
+        session = await coordinator.async_get_client_session()
+        async with session.post(
+            f"{coordinator.url}/api/msd/write_remote",
+            params={
+                "url": url,
+                "image": image,
+                "timeout": remote_timeout,
+                "remove_incomplete": 1,
+            },
+            auth=coordinator.get_client_auth(),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=10),
+        ) as response:
+            response.raise_for_status()
+            # kvmd keeps the request open and streams one JSON line per
+            # progress step; a failed download ends with an error line.
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                if "error" in result:
+                    raise PiKVMRequestError(
+                        f"Download of {image} failed: "
+                        f"{result.get('error_msg') or result['error']}"
+                    )
+                written = get_nested_value(result, ["image", "written"])
+                if written:
+                    transfer.sent = max(transfer.sent, written)
+    except asyncio.CancelledError:
+        transfer.status = "cancelled"
+        raise
+    except PiKVMRequestError as err:
+        transfer.status = "failed"
+        transfer.error = str(err)
+        raise
+    except (aiohttp.ClientError, OSError, ValueError) as err:
+        transfer.status = "failed"
+        transfer.error = str(err)
+        raise PiKVMRequestError(f"Download of {image} failed: {err}") from err
+    else:
+        transfer.status = "completed"
+        transfer.total = transfer.total or transfer.sent
+    finally:
+        unsub()
+        transfer.finished = time.monotonic()
+        coordinator.async_notify_event_listeners(MSD_TRANSFER_EVENT)
+
+    _LOGGER.debug(
+        "%s downloaded %s at %.1f MB/s",
+        coordinator.url,
+        image,
+        transfer.throughput / (1024 * 1024),
+    )
+    return transfer
+
+
+def async_cancel_transfer(coordinator: PiKVMDataUpdateCoordinator) -> bool:
+    """Cancel the running MSD transfer, if any."""
+    if coordinator.msd_transfer_task is None:
+        return False
+    coordinator.msd_transfer_task.cancel()
+    return True
+
+
+class _ChunkFanOut:
+    """Deliver every chunk read from one source to several consumers."""
+
+    def __init__(self, names) -> None:
+        self.queues: dict[str, asyncio.Queue] = {
+            name: asyncio.Queue(maxsize=FANOUT_QUEUE_DEPTH) for name in names
+        }
+
+    async def async_publish(self, chunk: bytes | None) -> None:
+        """Hand a chunk (or None for end of stream) to every attached consumer."""
+        for queue in list(self.queues.values()):
+            await queue.put(chunk)
+
+    async def async_iter(self, name: str) -> AsyncIterator[bytes]:
+        """Yield the chunks delivered to one consumer."""
+        queue = self.queues[name]
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+
+    def detach(self, name: str) -> None:
+        """Stop delivering to a consumer that finished or failed.
+
+        Draining the queue unblocks the reader if it is waiting on it.
+        """
+        queue = self.queues.pop(name, None)
+        while queue is not None and not queue.empty():
+            queue.get_nowait()
+
+
+async def _async_distribute_wave(
+    hass: HomeAssistant,
+    coordinators: dict[str, PiKVMDataUpdateCoordinator],
+    path: str,
+    image: str,
+    size: int,
+    limiter: BandwidthLimiter | None,
+    results: dict[str, dict],
+) -> None:
+    """Read the file once and upload it to every coordinator of the wave."""
+    fanout = _ChunkFanOut(coordinators)
+
+    async def _async_consume(name: str, coordinator: PiKVMDataUpdateCoordinator):
+        try:
+            transfer = await async_run_transfer(
+                coordinator,
+                async_upload_image(
+                    coordinator, fanout.async_iter(name), image, size, limiter
+                ),
+            )
+        except PiKVMRequestError as err:
+            results[name] = {"success": False, "error": str(err)}
+        except asyncio.CancelledError:
+            # Only this device's transfer was cancelled; keep serving the others.
+            if asyncio.current_task().cancelling():
+                raise
+            results[name] = {"success": False, "error": "cancelled"}
+        else:
+            results[name] = {
+                "success": True,
+                "throughput_mb_s": round(transfer.throughput / (1024 * 1024), 2),
+            }
+        finally:
+            fanout.detach(name)
+
+    consumers = [
+        hass.async_create_task(_async_consume(name, coordinator))
+        for name, coordinator in coordinators.items()
+    ]
+    try:
+        async with contextlib.aclosing(async_iter_file(hass, path)) as chunks:
+            async for chunk in chunks:
+                if not fanout.queues:
+                    break
+                await fanout.async_publish(chunk)
+        await fanout.async_publish(None)
+        await asyncio.gather(*consumers)
+    finally:
+        for consumer in consumers:
+            consumer.cancel()
+        for name in coordinators:
+            if name not in results:
+                results[name] = {"success": False, "error": "cancelled"}
+
+
+async def async_distribute_image(
+    hass: HomeAssistant,
+    coordinators: dict[str, PiKVMDataUpdateCoordinator],
+    path: str,
+    image: str,
+    max_concurrent: int,
+    limiter: BandwidthLimiter | None = None,
+) -> dict[str, dict]:
+    """Upload one image to many PiKVMs, reading the source once per wave.
+
+    Up to max_concurrent devices are served from a single read of the file.
+    The limiter, if given, caps the combined bandwidth of all uploads.
+    """
+    size = await async_get_file_size(hass, path)
+    results: dict[str, dict] = {}
+    names = list(coordinators)
+    for start in range(0, len(names), max_concurrent):
+        wave = {name: coordinators[name] for name in names[start : start + max_concurrent]}
+        await _async_distribute_wave(hass, wave, path, image, size, limiter, results)
+    return results
+
+
+async def async_distribute_remote(
+    coordinators: dict[str, PiKVMDataUpdateCoordinator],
+    url: str,
+    image: str,
+    remote_timeout: int,
+    max_concurrent: int,
+) -> dict[str, dict]:
+    """Have many PiKVMs download the same image, max_concurrent at a time."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+    results: dict[str, dict] = {}
+
+    async def _async_download(name: str, coordinator: PiKVMDataUpdateCoordinator):
+        async with semaphore:
+            try:
+                transfer = await async_run_transfer(
+                    coordinator,
+                    async_download_remote(coordinator, url, image, remote_timeout),
+                )
+            except PiKVMRequestError as err:
+                results[name] = {"success": False, "error": str(err)}
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                results[name] = {"success": False, "error": "cancelled"}
+            else:
+                results[name] = {
+                    "success": True,
+                    "throughput_mb_s": round(transfer.throughput / (1024 * 1024), 2),
+                }
+
+    await asyncio.gather(
+        *(_async_download(name, coordinator) for name, coordinator in coordinators.items())
+    )
+    return results
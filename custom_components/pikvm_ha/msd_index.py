@@ -0,0 +1,169 @@
+"""Content-hash index used to skip MSD uploads that are already on a device.
+
+kvmd only reports the name, size and completeness of stored images, so the
+content of an image is known from the uploads made by this integration: each
+successful upload records the SHA-256 of the source file per device serial.
+An image is current when the device still lists it with the same size and
+the recorded hash matches the source file.
+
+Source file hashes are cached by path, mtime and size, so a large ISO is only
+read once for hashing no matter how many devices it is pushed to.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import CONF_SERIAL, DATA_MSD_IMAGE_INDEX, DOMAIN
+from .msd import CHUNK_SIZE
+from .utils import get_nested_value
+
+if TYPE_CHECKING:
+    from .coordinator import PiKVMDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.msd_image_index"
+SAVE_DELAY = 10
+
+
+def hash_file(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Return the SHA-256 of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def async_get_device_images(
+    coordinator: PiKVMDataUpdateCoordinator,
+) -> dict[str, dict]:
+    """Fetch the images currently stored on a device, keyed by name."""
+    response = await coordinator.async_request("GET", "/api/msd")
+    return get_nested_value(
+        response.json().get("result"), ["storage", "images"], {}
+    ) or {}
+
+
+class MSDImageIndex:
+    """Cached source file hashes and the images known to be on each device."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._files: dict[str, dict] = {}
+        self._devices: dict[str, dict[str, dict]] = {}
+
+    async def async_load(self) -> None:
+        """Load the index from storage."""
+        data = await self._store.async_load() or {}
+        self._files = data.get("files", {})
+        self._devices = data.get("devices", {})
+
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {"files": self._files, "devices": self._devices}, SAVE_DELAY
+        )
+
+    async def async_hash_file(self, path: str) -> tuple[int, str]:
+        """Return the size and hash of a file, hashing it only if it changed."""
+        stat = await self.hass.async_add_executor_job(os.stat, path)
+        cached = self._files.get(path)
+        if (
+            cached
+            and cached["mtime_ns"] == stat.st_mtime_ns
+            and cached["size"] == stat.st_size
+        ):
+            return stat.st_size, cached["sha256"]
+
+        _LOGGER.debug("Hashing %s (%s bytes)", path, stat.st_size)
+        sha256 = await self.hass.async_add_executor_job(hash_file, path)
+        self._files[path] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256,
+        }
+        self._async_schedule_save()
+        return stat.st_size, sha256
+
+    def async_record_upload(
+        self, coordinator: PiKVMDataUpdateCoordinator, image: str, size: int, sha256: str
+    ) -> None:
+        """Remember that a device received an image with the given content."""
+        serial = coordinator.config_entry.data[CONF_SERIAL]
+        self._devices.setdefault(serial, {})[image] = {"size": size, "sha256": sha256}
+        self._async_schedule_save()
+
+    def async_forget_image(
+        self, coordinator: PiKVMDataUpdateCoordinator, image: str
+    ) -> None:
+        """Forget the content of an image written by other means."""
+        serial = coordinator.config_entry.data[CONF_SERIAL]
+        if self._devices.get(serial, {}).pop(image, None) is not None:
+            self._async_schedule_save()
+
+    async def async_check_device(
+        self, coordinator: PiKVMDataUpdateCoordinator, image: str, size: int, sha256: str
+    ) -> tuple[bool, bool]:
+        """Return (is_current, name_taken) for an image on a device.
+
+        The device's image list is fetched fresh, so images removed on the
+        PiKVM since the last poll are not mistaken for current ones.
+        """
+        stored = (await async_get_device_images(coordinator)).get(image)
+        if stored is None:
+            return False, False
+
+        serial = coordinator.config_entry.data[CONF_SERIAL]
+        record = self._devices.get(serial, {}).get(image)
+        current = (
+            stored.get("size") == size
+            and stored.get("complete", True)
+            and record is not None
+            and record["size"] == size
+            and record["sha256"] == sha256
+        )
+        return current, True
+
+    async def async_prepare_upload(
+        self,
+        coordinator: PiKVMDataUpdateCoordinator,
+        image: str,
+        size: int,
+        sha256: str,
+        force: bool = False,
+    ) -> bool:
+        """Return True if the image must be uploaded to the device.
+
+        An outdated image with the same name is removed first, since kvmd
+        refuses to overwrite existing images.
+        """
+        current, name_taken = await self.async_check_device(
+            coordinator, image, size, sha256
+        )
+        if current and not force:
+            _LOGGER.debug("%s is already current on %s", image, coordinator.url)
+            return False
+        if name_taken:
+            _LOGGER.debug("Replacing outdated %s on %s", image, coordinator.url)
+            await coordinator.async_msd_remove_image(image)
+        return True
+
+
+async def async_get_image_index(hass: HomeAssistant) -> MSDImageIndex:
+    """Return the loaded domain-wide image index."""
+    index = hass.data.get(DATA_MSD_IMAGE_INDEX)
+    if index is None:
+        index = MSDImageIndex(hass)
+        await index.async_load()
+        hass.data[DATA_MSD_IMAGE_INDEX] = index
+    return index
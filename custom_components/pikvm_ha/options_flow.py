@@ -16,8 +16,10 @@ from .const import (
     DOMAIN,
     MANUFACTURER,
 )
+from .entry_index import async_get_serial_index
 from .utils import (
-    create_data_schema,
+    create_options_schema,
+    extract_options,
     format_url,
     get_translations,
     update_existing_entry,
@@ -43,6 +45,8 @@ class PiKVMOptionsFlowHandler(config_entries.OptionsFlow):
         _LOGGER.debug("Entered async_step_init with data: %s", user_input)
 
         if user_input is not None:
+            options = extract_options(user_input, self.config_entry.options)
+
             # Validate the new credentials
             url = format_url(user_input[CONF_HOST])
             username = user_input.get(CONF_USERNAME, DEFAULT_USERNAME)
@@ -79,22 +83,19 @@ class PiKVMOptionsFlowHandler(config_entries.OptionsFlow):
                         response.serial,
                     )
 
-                    existing_entry = None
-                    for entry in self.hass.config_entries.async_entries(DOMAIN):
-                        if entry.unique_id == response.serial:
-                            existing_entry = entry
-                            break
-
+                    existing_entry = async_get_serial_index(self.hass).async_get_entry(
+                        response.serial
+                    )
                     if existing_entry:
                         update_existing_entry(self.hass, existing_entry, user_input)
-                        return self.async_create_entry(title="", data={})
+                        return self.async_create_entry(title="", data=options)
 
                     user_input["serial"] = response.serial
                     new_data = {**self.config_entry.data, **user_input}
                     self.hass.config_entries.async_update_entry(
                         self.config_entry, data=new_data
                     )
-                    return self.async_create_entry(title="", data={})
+                    return self.async_create_entry(title="", data=options)
 
                 else:
                     errors["base"] = "cannot_connect"
@@ -109,13 +110,14 @@ class PiKVMOptionsFlowHandler(config_entries.OptionsFlow):
         default_password = self.config_entry.data.get(CONF_PASSWORD, DEFAULT_PASSWORD)
         default_totp = self.config_entry.data.get(CONF_TOTP, "")
 
-        data_schema = create_data_schema(
+        data_schema = create_options_schema(
             {
                 CONF_HOST: default_url,
                 CONF_USERNAME: default_username,
                 CONF_PASSWORD: default_password,
                 CONF_TOTP: default_totp,
-            }
+            },
+            self.config_entry.options,
         )
 
         return self.async_show_form(
@@ -178,12 +180,9 @@ async def handle_user_input(self, user_input):
             "PiKVM device successfully found at %s with serial %s", url, response.serial
         )
 
-        existing_entry = None
-        for entry in self.hass.config_entries.async_entries(DOMAIN):
-            if entry.unique_id == response.serial:
-                existing_entry = entry
-                break
-
+        existing_entry = async_get_serial_index(self.hass).async_get_entry(
+            response.serial
+        )
         if existing_entry:
             update_existing_entry(self.hass, existing_entry, user_input)
             return self.async_create_entry(title="", data={})
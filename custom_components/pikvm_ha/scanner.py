@@ -0,0 +1,152 @@
+"""Active discovery of PiKVMs on networks where mDNS does not reach.
+
+Every address of the given networks is probed in two stages, by a bounded
+pool of workers:
+
+1. a TCP connection and TLS handshake on the HTTPS port, which is cheap and
+   rules out almost every address within the connect timeout;
+2. for the hosts that answered, a request to /api/info, whose kvmd JSON
+   envelope identifies a PiKVM and, with valid credentials, its serial.
+
+Found devices are handed to the config flow like zeroconf discoveries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import contextlib
+import ipaddress
+import logging
+import ssl
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.ssl import get_default_no_verify_context
+
+from .const import CONF_MODEL, CONF_NAME, CONF_SERIAL
+from .utils import get_nested_value
+
+_LOGGER = logging.getLogger(__name__)
+
+HTTPS_PORT = 443
+DEFAULT_MAX_CONCURRENT = 256
+DEFAULT_CONNECT_TIMEOUT = 1.0
+# /api/info is slower than a handshake, especially on a busy device
+INFO_TIMEOUT = 10
+MAX_SCAN_HOSTS = 65536
+
+
+def scan_hosts(networks: Iterable[str]) -> list[str]:
+    """Return the addresses to probe in the given CIDR networks.
+
+    Raises ValueError for an invalid network or too many addresses.
+    """
+    hosts: dict[str, None] = {}
+    for network in networks:
+        parsed = ipaddress.ip_network(network, strict=False)
+        if len(hosts) + parsed.num_addresses > MAX_SCAN_HOSTS:
+            raise ValueError(f"Cannot scan more than {MAX_SCAN_HOSTS} addresses")
+        hosts.update(dict.fromkeys(str(address) for address in parsed.hosts()))
+    return list(hosts)
+
+
+def _base_url(host: str) -> str:
+    if ipaddress.ip_address(host).version == 6:
+        return f"https://[{host}]"
+    return f"https://{host}"
+
+
+async def async_probe_tls(host: str, timeout: float) -> bool:
+    """Return whether host completes a TLS handshake on the HTTPS port."""
+    try:
+        async with asyncio.timeout(timeout):
+            _reader, writer = await asyncio.open_connection(
+                host, HTTPS_PORT, ssl=get_default_no_verify_context()
+            )
+    except (OSError, TimeoutError, ssl.SSLError):
+        return False
+    writer.close()
+    with contextlib.suppress(OSError, TimeoutError, ssl.SSLError):
+        async with asyncio.timeout(timeout):
+            await writer.wait_closed()
+    return True
+
+
+async def async_identify(
+    session: aiohttp.ClientSession, host: str, username: str, password: str
+) -> dict[str, Any] | None:
+    """Return the identity of the PiKVM at host, or None if it is not one.
+
+    The serial is None when the credentials were not accepted.
+    """
+    url = f"{_base_url(host)}/api/info"
+    timeout = aiohttp.ClientTimeout(total=INFO_TIMEOUT)
+    async with session.get(url, timeout=timeout) as response:
+        if response.status == 401:
+            body = await response.json(content_type=None)
+            if not isinstance(body, dict) or body.get("ok") is not False:
+                return None
+            async with session.get(
+                url, auth=aiohttp.BasicAuth(username, password), timeout=timeout
+            ) as response:
+                if response.status in (401, 403):
+                    return {"host": host, CONF_SERIAL: None}
+                response.raise_for_status()
+                body = await response.json(content_type=None)
+        elif response.status == 200:
+            # Authentication disabled on the device
+            body = await response.json(content_type=None)
+        else:
+            return None
+
+    if not isinstance(body, dict) or body.get("ok") is not True:
+        return None
+    result = body.get("result") or {}
+    platform = get_nested_value(result, ["hw", "platform"], {})
+    serial = platform.get(CONF_SERIAL)
+    if not serial:
+        return None
+    return {
+        "host": host,
+        CONF_SERIAL: str(serial).lower(),
+        CONF_MODEL: platform.get(CONF_MODEL),
+        "name": get_nested_value(result, ["meta", "server", CONF_NAME]),
+    }
+
+
+async def async_scan_networks(
+    hass: HomeAssistant,
+    networks: Iterable[str],
+    username: str,
+    password: str,
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+) -> list[dict[str, Any]]:
+    """Probe every address of networks and return the PiKVMs found."""
+    hosts = scan_hosts(networks)
+    session = async_get_clientsession(hass, verify_ssl=False)
+    pending = iter(hosts)
+    found: list[dict[str, Any]] = []
+
+    async def _async_worker() -> None:
+        # Workers share one iterator, so at most max_concurrent probes run
+        for host in pending:
+            if not await async_probe_tls(host, connect_timeout):
+                continue
+            try:
+                device = await async_identify(session, host, username, password)
+            except (aiohttp.ClientError, TimeoutError, ValueError) as err:
+                _LOGGER.debug("Scanned host %s is not a PiKVM: %s", host, err)
+                continue
+            if device is not None:
+                found.append(device)
+
+    _LOGGER.debug("Scanning %s addresses for PiKVMs", len(hosts))
+    await asyncio.gather(
+        *(_async_worker() for _ in range(min(max_concurrent, len(hosts))))
+    )
+    return sorted(found, key=lambda device: ipaddress.ip_address(device["host"]))
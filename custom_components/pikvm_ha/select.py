@@ -0,0 +1,69 @@
+"""Platform for select integration."""
+
+import logging
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import PiKVMRequestError
+from .entity import PiKVMEntity
+from .kvm_switch import ACTIVE_PORT_EVENT, get_active_port, get_port_label, get_ports
+from .utils import get_device_name, get_unique_id_base
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PiKVMSwitchActivePortSelect(PiKVMEntity, SelectEntity):
+    """Select choosing the active port of the KVM switch attached to the PiKVM."""
+
+    _push_events = (ACTIVE_PORT_EVENT,)
+
+    def __init__(self, coordinator, unique_id_base, device_name) -> None:
+        """Initialize the select."""
+        super().__init__(coordinator, unique_id_base)
+        self._attr_unique_id = f"{unique_id_base}_switch_active_port"
+        self._attr_name = f"{device_name} Active Port"
+        self._attr_icon = "mdi:video-switch"
+
+    @property
+    def options(self) -> list[str]:
+        """Return the label of every port."""
+        ports = get_ports(self.coordinator)
+        return [get_port_label(ports, port) for port in range(len(ports))]
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the label of the active port."""
+        port = get_active_port(self.coordinator)
+        if port is None:
+            return None
+        return get_port_label(get_ports(self.coordinator), port)
+
+    async def async_select_option(self, option: str) -> None:
+        """Switch to the selected port."""
+        port = self.options.index(option)
+        try:
+            await self.coordinator.async_switch_set_active(port)
+        except PiKVMRequestError as err:
+            raise HomeAssistantError(f"Failed to switch to port {option}: {err}") from err
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up PiKVM selects from a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    if not get_ports(coordinator):
+        return
+    unique_id_base = get_unique_id_base(config_entry, coordinator)
+    device_name = get_device_name(coordinator)
+
+    async_add_entities(
+        [PiKVMSwitchActivePortSelect(coordinator, unique_id_base, device_name)]
+    )
@@ -2,23 +2,34 @@
 
 from collections.abc import Mapping
 import logging
+import time
+from typing import Any
 
-from voluptuous import Any
-
+from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .entity import PiKVMEntity
-from .utils import get_nested_value, get_unique_id_base
+from .utils import get_device_name, get_nested_value, get_unique_id_base
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rolling health statistics change with every update and are not recorded
+HISTORY_ATTRIBUTES = frozenset({"min", "mean", "max", "rate_per_min"})
+# Live updates an extra must be missing from before its sensor is removed
+EXTRA_MISSING_UPDATES = 3
+
 
-class PiKVMBaseSensor(PiKVMEntity):
+class PiKVMBaseSensor(PiKVMEntity, SensorEntity):
     """Base class for a PiKVM sensor."""
 
+    # Values read from the coordinator data: name -> key path. They are
+    # compiled into the coordinator's per-update snapshot.
+    _value_paths: dict[str, tuple[str, ...]] = {}
+
     def __init__(
         self,
         coordinator,
@@ -32,22 +43,75 @@ class PiKVMBaseSensor(PiKVMEntity):
         super().__init__(coordinator, unique_id_base)
         self._attr_unique_id = f"{unique_id_base}_{sensor_type}"
         self._attr_name = name
-        self._attr_unit_of_measurement = unit
+        self._attr_native_unit_of_measurement = unit
         self._attr_icon = icon
         self._unique_id_base = unique_id_base
         self._sensor_type = sensor_type
+        self._value_slots: dict[str, str] = {}
+        self._attributes: dict[str, Any] | None = None
+        self._attributes_generation = None
+        self._last_written = None
+        self._last_written_at: float | None = None
+        for value_name, keys in self._value_paths.items():
+            self._register_value(value_name, keys)
+
+    def _register_value(self, value_name: str, keys) -> None:
+        """Read the value at a key path of the coordinator data as value_name."""
+        self._value_slots[value_name] = self.coordinator.snapshot_schema.register(keys)
+
+    def _value(self, value_name: str, default=None):
+        """Return a value from the current snapshot."""
+        value = getattr(self.coordinator.snapshot, self._value_slots[value_name])
+        return default if value is None else value
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
-        """Return the state attributes."""
+        """Return the state attributes, computed once per update."""
+        generation = (self.coordinator.snapshot, self.coordinator.push_generation)
+        if generation != self._attributes_generation:
+            self._attributes = self._compute_attributes()
+            self._attributes_generation = generation
+        return self._attributes
+
+    def _compute_attributes(self) -> dict[str, Any]:
+        """Return freshly computed state attributes."""
+        if self.coordinator.stale:
+            return {"ip": self.coordinator.url, "stale": True}
         return {"ip": self.coordinator.url}
 
-    @property
-    def state(self) -> str | int | float | bool | None:
-        """Return the state of the sensor."""
-        raise NotImplementedError(
-            "The state method must be implemented by the subclass."
-        )
+    @callback
+    def _async_write_update(self) -> None:
+        """Write the state unless it is identical or too close to the last one.
+
+        Sensors with a deadband are additionally held back until their value
+        moved far enough, see write_filter.
+        """
+        written = (self.available, self.state, self.extra_state_attributes)
+        last = self._last_written
+        write_filter = self.coordinator.write_filter
+        now = time.monotonic()
+        filtered = write_filter.applies_to(self._sensor_type)
+        if filtered and last is not None and last[0] == written[0]:
+            # Identical states go through the filter too, for its heartbeat
+            if not write_filter.should_write(
+                self._sensor_type, now, self._last_written_at, last[1], written[1]
+            ):
+                return
+        elif written == last:
+            return
+        elif filtered:
+            # First writes and availability changes bypass the filter
+            write_filter.count(self._sensor_type, True)
+        self._last_written = written
+        self._last_written_at = now
+        self.async_write_ha_state()
+
+    def _history_attributes(self, metric: str) -> dict[str, float]:
+        """Return the rolling min, mean, max and rate of change of a health metric."""
+        stats = self.coordinator.health_history.stats(metric)
+        if stats is None:
+            return {}
+        return {key: round(value, 2) for key, value in stats.items()}
 
 
 async def async_setup_entry(
@@ -59,15 +123,7 @@ async def async_setup_entry(
     _LOGGER.debug("Setting up PiKVM sensors from config entry")
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     unique_id_base = get_unique_id_base(config_entry, coordinator)
-    device_name = get_nested_value(
-        coordinator.data, ["meta", "server", "host"], "pikvm"
-    )
-
-    # Use "pikvm" if the device name is "localhost.localdomain"
-    if device_name == "localhost.localdomain":
-        device_name = DOMAIN
-    else:
-        device_name = device_name.replace(".", "_")
+    device_name = get_device_name(coordinator)
 
     lazy_import_sensors()
     # List of sensors to create
@@ -85,23 +141,81 @@ async def async_setup_entry(
         sensor_classes["msd_enabled"](coordinator, unique_id_base, device_name),
         sensor_classes["msd_drive"](coordinator, unique_id_base, device_name),
         sensor_classes["msd_storage"](coordinator, unique_id_base, device_name),
+        sensor_classes["msd_upload"](coordinator, unique_id_base, device_name),
+        sensor_classes["streamer_resolution"](coordinator, unique_id_base, device_name),
+        sensor_classes["streamer_fps"](coordinator, unique_id_base, device_name),
+        sensor_classes["streamer_quality"](coordinator, unique_id_base, device_name),
+        sensor_classes["streamer_clients"](coordinator, unique_id_base, device_name),
     ]
 
-    # Dynamically create sensors for extras
-    extras = get_nested_value(coordinator.data, ["extras"], {})
-    for extra_name, extra_data in extras.items():
-        sensors.append(
+    async_add_entities(sensors)
+    _LOGGER.debug("%s PiKVM sensors added to Home Assistant", device_name)
+
+    # Extras come and go as services are enabled on the PiKVM; follow them
+    # on every update instead of waiting for a reload
+    extra_sensors: dict[str, PiKVMBaseSensor] = {}
+    # Extra name -> consecutive live updates it was missing from
+    extra_misses: dict[str, int] = {}
+
+    @callback
+    def _async_sync_extras() -> None:
+        """Add sensors for new extras and remove those of vanished ones."""
+        extras = get_nested_value(coordinator.data, ["extras"])
+        if not coordinator.last_update_success or not isinstance(extras, dict):
+            return
+
+        added = [
             sensor_classes["extra"](
-                coordinator,
-                extra_name,
-                extra_data,
-                unique_id_base,
+                coordinator, extra_name, extra_data, unique_id_base, device_name
+            )
+            for extra_name, extra_data in extras.items()
+            if extra_name not in extra_sensors
+        ]
+        for sensor in added:
+            extra_sensors[sensor.extra_name] = sensor
+        if added:
+            _LOGGER.debug(
+                "Adding %s extra sensors: %s",
                 device_name,
+                ", ".join(sensor.extra_name for sensor in added),
             )
-        )
+            async_add_entities(added)
 
-    async_add_entities(sensors, True)
-    _LOGGER.debug("%s PiKVM sensors added to Home Assistant", device_name)
+        # Cached data may predate the extras, and kvmd can omit one for an
+        # update; only remove a sensor after several live updates without it.
+        # Its registry entry is kept, with the user's name and area.
+        if coordinator.stale:
+            return
+        for extra_name in set(extra_misses) & set(extras):
+            del extra_misses[extra_name]
+        for extra_name in set(extra_sensors) - set(extras):
+            extra_misses[extra_name] = extra_misses.get(extra_name, 0) + 1
+            if extra_misses[extra_name] < EXTRA_MISSING_UPDATES:
+                continue
+            del extra_misses[extra_name]
+            sensor = extra_sensors.pop(extra_name)
+            _LOGGER.debug("Removing %s extra sensor: %s", device_name, extra_name)
+            hass.async_create_task(sensor.async_remove())
+
+    _async_sync_extras()
+
+    # Extras that disappeared while Home Assistant was stopped, as far as
+    # live data tells; the cache may be older than the device's extras
+    if not coordinator.stale and isinstance(
+        get_nested_value(coordinator.data, ["extras"]), dict
+    ):
+        ent_reg = er.async_get(hass)
+        prefix = f"{unique_id_base}_extra_"
+        for entry in er.async_entries_for_config_entry(ent_reg, config_entry.entry_id):
+            if (
+                entry.domain == "sensor"
+                and entry.unique_id.startswith(prefix)
+                and entry.unique_id[len(prefix) :] not in extra_sensors
+            ):
+                _LOGGER.debug("Removing stale extra sensor %s", entry.entity_id)
+                ent_reg.async_remove(entry.entity_id)
+
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_sync_extras))
 
 
 # pylint: disable=import-outside-toplevel
@@ -115,6 +229,13 @@ def lazy_import_sensors():
     from .sensors.pikvm_msd_drive_sensor import PiKVMSDDriveSensor
     from .sensors.pikvm_msd_enabled_sensor import PiKVMSDEnabledSensor
     from .sensors.pikvm_msd_storage_sensor import PiKVMSDStorageSensor
+    from .sensors.pikvm_msd_upload_sensor import PiKVMSDUploadSensor
+    from .sensors.pikvm_streamer_sensor import (
+        PiKVMStreamerClientsSensor,
+        PiKVMStreamerFpsSensor,
+        PiKVMStreamerQualitySensor,
+        PiKVMStreamerResolutionSensor,
+    )
     from .sensors.pikvm_throttling_sensor import PiKVMThrottlingSensor
 
     return {
@@ -126,5 +247,10 @@ def lazy_import_sensors():
         "msd_drive": PiKVMSDDriveSensor,
         "msd_enabled": PiKVMSDEnabledSensor,
         "msd_storage": PiKVMSDStorageSensor,
+        "msd_upload": PiKVMSDUploadSensor,
+        "streamer_clients": PiKVMStreamerClientsSensor,
+        "streamer_fps": PiKVMStreamerFpsSensor,
+        "streamer_quality": PiKVMStreamerQualitySensor,
+        "streamer_resolution": PiKVMStreamerResolutionSensor,
         "throttling": PiKVMThrottlingSensor,
     }
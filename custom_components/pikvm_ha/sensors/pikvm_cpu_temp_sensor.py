@@ -2,27 +2,23 @@
 
 import logging
 
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import UnitOfTemperature
-from homeassistant.helpers import temperature
 
-from .. import PiKVMDataUpdateCoordinator
-from ..sensor import PiKVMBaseSensor
-from ..utils import get_nested_value
+from ..coordinator import PiKVMDataUpdateCoordinator
+from ..sensor import HISTORY_ATTRIBUTES, PiKVMBaseSensor
 
 _LOGGER = logging.getLogger(__name__)
 
 
-# Function to convert temperature
-def convert_temperature(value, from_unit, to_unit):
-    """Convert temperature from one unit to another."""
-    if from_unit == to_unit:
-        return value
-    return temperature.convert_temperature(value, from_unit, to_unit)
-
-
 class PiKVMCpuTempSensor(PiKVMBaseSensor):
     """Representation of a PiKVM CPU temperature sensor."""
 
+    _value_paths = {"temp": ("hw", "health", "temp", "cpu")}
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = HISTORY_ATTRIBUTES
+
     def __init__(
         self,
         coordinator: PiKVMDataUpdateCoordinator,
@@ -36,28 +32,30 @@ class PiKVMCpuTempSensor(PiKVMBaseSensor):
             unique_id_base,
             "cpu_temp",
             name,
-            "°C",
+            UnitOfTemperature.CELSIUS,
             "mdi:thermometer",
         )
 
     @property
-    def state(self):
-        """Return the state of the sensor in preferred units."""
-        value = get_nested_value(self.coordinator.data, ["hw", "health", "temp", "cpu"])
+    def native_value(self):
+        """Return the CPU temperature in °C; Home Assistant converts it for display."""
+        value = self._value("temp")
         try:
-            temp_value = float(value)
+            return float(value)
         except (TypeError, ValueError):
             return None  # or handle the error appropriately
-        return self.coordinator.hass.config.units.temperature(
-            temp_value, UnitOfTemperature.CELSIUS
-        )
 
-    @property
-    def unit_of_measurement(self):
-        """Return the preferred units of measure."""
-        return self.coordinator.hass.config.units.temperature_unit
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return super().extra_state_attributes
+    def _compute_attributes(self):
+        """Return the state attributes in preferred units."""
+        attributes = super()._compute_attributes()
+        convert = self.coordinator.hass.config.units.temperature
+        for key, value in self._history_attributes("cpu_temp").items():
+            if key == "rate_per_min":
+                # A rate is a temperature difference: scale it, don't offset it
+                value = convert(value, UnitOfTemperature.CELSIUS) - convert(
+                    0, UnitOfTemperature.CELSIUS
+                )
+            else:
+                value = convert(value, UnitOfTemperature.CELSIUS)
+            attributes[key] = round(value, 2)
+        return attributes
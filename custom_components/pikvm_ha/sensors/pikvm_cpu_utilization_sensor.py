@@ -5,9 +5,11 @@ Represents a sensor for monitoring the CPU utilization of a PiKVM device.
 
 import logging
 
-from .. import PiKVMDataUpdateCoordinator
-from ..sensor import PiKVMBaseSensor
-from ..utils import get_nested_value
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import PERCENTAGE
+
+from ..coordinator import PiKVMDataUpdateCoordinator
+from ..sensor import HISTORY_ATTRIBUTES, PiKVMBaseSensor
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,6 +17,10 @@ _LOGGER = logging.getLogger(__name__)
 class PiKVMCpuUtilizationSensor(PiKVMBaseSensor):
     """Representation of a PiKVM CPU temperature sensor."""
 
+    _value_paths = {"cpu": ("hw", "health", "cpu")}
+    _unrecorded_attributes = HISTORY_ATTRIBUTES
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
     def __init__(
         self,
         coordinator: PiKVMDataUpdateCoordinator,
@@ -28,28 +34,22 @@ class PiKVMCpuUtilizationSensor(PiKVMBaseSensor):
             unique_id_base,
             "cpu_utilization",
             name,
-            "%",
+            PERCENTAGE,
             "mdi:cpu-64-bit",
         )
 
     @property
-    def state(self):
+    def native_value(self):
         """Return the state of the sensor in preferred units."""
-        return get_nested_value(
-            self.coordinator.data, ["hw", "health", "cpu", "percent"]
-        )
+        return self._value("cpu", {}).get("percent")
 
     @property
     def available(self):
         """Return True if the sensor data is available."""
-        return "cpu" in get_nested_value(self.coordinator.data, ["hw", "health"], {})
+        return self._value("cpu") is not None
 
-    @property
-    def unit_of_measurement(self):
-        """Return the preferred units of measure."""
-        return "%"
-
-    @property
-    def extra_state_attributes(self):
+    def _compute_attributes(self):
         """Return the state attributes."""
-        return super().extra_state_attributes
+        attributes = super()._compute_attributes()
+        attributes.update(self._history_attributes("cpu_percent"))
+        return attributes
@@ -3,7 +3,6 @@
 from homeassistant.const import EntityCategory
 
 from ..sensor import PiKVMBaseSensor
-from ..utils import get_nested_value
 
 
 class PiKVMExtraSensor(PiKVMBaseSensor):
@@ -28,23 +27,17 @@ class PiKVMExtraSensor(PiKVMBaseSensor):
             sensor_name,
             icon=icon,
         )
-        self._extra_name = name
+        self.extra_name = name
+        self._register_value("extra", ("extras", name))
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
     @property
-    def state(self):
+    def native_value(self):
         """Return the state of the sensor."""
-        extra_data = get_nested_value(
-            self.coordinator.data, ["extras", self._extra_name], {}
-        )
-        return extra_data.get("enabled", False)
+        return self._value("extra", {}).get("enabled", False)
 
-    @property
-    def extra_state_attributes(self):
+    def _compute_attributes(self):
         """Return the state attributes."""
-        attributes = super().extra_state_attributes
-        extra_data = get_nested_value(
-            self.coordinator.data, ["extras", self._extra_name], {}
-        )
-        attributes.update(extra_data)
+        attributes = super()._compute_attributes()
+        attributes.update(self._value("extra", {}))
         return attributes
@@ -1,12 +1,18 @@
 """Support for PiKVM fan speed sensor."""
 
-from ..sensor import PiKVMBaseSensor
-from ..utils import get_nested_value
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import PERCENTAGE, REVOLUTIONS_PER_MINUTE
+
+from ..sensor import HISTORY_ATTRIBUTES, PiKVMBaseSensor
 
 
 class PiKVMFanSpeedSensor(PiKVMBaseSensor):
     """Representation of a PiKVM fan speed sensor."""
 
+    _value_paths = {"fan": ("fan",)}
+    _unrecorded_attributes = HISTORY_ATTRIBUTES
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
     def __init__(self, coordinator, unique_id_base, device_name) -> None:
         """Initialize the sensor."""
         name = f"{device_name} Fan Speed"
@@ -22,18 +28,19 @@ class PiKVMFanSpeedSensor(PiKVMBaseSensor):
                     self.hall_available = hall_data.get("available", False)
 
         # Set the unit of measurement based on hall availability
-        self._attr_unit_of_measurement = "RPM" if self.hall_available else "%"
+        self._attr_native_unit_of_measurement = (
+            REVOLUTIONS_PER_MINUTE if self.hall_available else PERCENTAGE
+        )
 
     @property
     def available(self):
         """Return True if the sensor data is available."""
-        fan = get_nested_value(self.coordinator.data, ["fan"], {})
-        return "state" in fan
+        return "state" in self._value("fan", {})
 
     @property
-    def state(self):
+    def native_value(self):
         """Return the state of the sensor."""
-        fan_state = get_nested_value(self.coordinator.data, ["fan", "state"], {})
+        fan_state = self._value("fan", {}).get("state") or {}
         if not fan_state:
             return None
 
@@ -44,11 +51,11 @@ class PiKVMFanSpeedSensor(PiKVMBaseSensor):
         fan_data = fan_state.get("fan", {})
         return fan_data.get("speed", None) if fan_data else None
 
-    @property
-    def extra_state_attributes(self):
+    def _compute_attributes(self):
         """Return the state attributes."""
-        attributes = super().extra_state_attributes
-        fan_state = get_nested_value(self.coordinator.data, ["fan", "state"], {})
+        attributes = super()._compute_attributes()
+        fan_state = self._value("fan", {}).get("state") or {}
         if fan_state:
             attributes.update(fan_state)
+        attributes.update(self._history_attributes("fan"))
         return attributes
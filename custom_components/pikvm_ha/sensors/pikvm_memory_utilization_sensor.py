@@ -3,9 +3,12 @@
 import logging
 from typing import NamedTuple
 
-from .. import PiKVMDataUpdateCoordinator
-from ..sensor import PiKVMBaseSensor
-from ..utils import bytes_to_mb, get_nested_value
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import PERCENTAGE
+
+from ..coordinator import PiKVMDataUpdateCoordinator
+from ..sensor import HISTORY_ATTRIBUTES, PiKVMBaseSensor
+from ..utils import bytes_to_mb
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +26,10 @@ class PiKVMResponse(NamedTuple):
 class PiKVMMemoryUtilizationSensor(PiKVMBaseSensor):
     """Representation of a PiKVM CPU temperature sensor."""
 
+    _value_paths = {"mem": ("hw", "health", "mem")}
+    _unrecorded_attributes = HISTORY_ATTRIBUTES | {"available MB"}
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
     def __init__(
         self,
         coordinator: PiKVMDataUpdateCoordinator,
@@ -36,37 +43,25 @@ class PiKVMMemoryUtilizationSensor(PiKVMBaseSensor):
             unique_id_base,
             "memory_utilization",
             name,
-            "%",
+            PERCENTAGE,
             "mdi:memory",
         )
 
     @property
-    def state(self):
+    def native_value(self):
         """Return the state of the sensor in preferred units."""
-        return get_nested_value(
-            self.coordinator.data, ["hw", "health", "mem", "percent"]
-        )
+        return self._value("mem", {}).get("percent")
 
     @property
     def available(self):
         """Return True if the sensor data is available."""
-        return "mem" in get_nested_value(self.coordinator.data, ["hw", "health"], {})
-
-    @property
-    def unit_of_measurement(self):
-        """Return the preferred units of measure."""
-        return "%"
+        return self._value("mem") is not None
 
-    @property
-    def extra_state_attributes(self):
+    def _compute_attributes(self):
         """Return the state attributes."""
-        attributes = super().extra_state_attributes
-        available_bytes = get_nested_value(
-            self.coordinator.data, ["hw", "health", "mem", "available"]
-        )
-        total_bytes = get_nested_value(
-            self.coordinator.data, ["hw", "health", "mem", "total"]
-        )
-        attributes["available MB"] = bytes_to_mb(available_bytes)
-        attributes["total MB"] = bytes_to_mb(total_bytes)
+        attributes = super()._compute_attributes()
+        mem = self._value("mem", {})
+        attributes["available MB"] = bytes_to_mb(mem.get("available"))
+        attributes["total MB"] = bytes_to_mb(mem.get("total"))
+        attributes.update(self._history_attributes("mem_percent"))
         return attributes
@@ -1,27 +1,27 @@
 """Support for PiKVM MSD drive sensor."""
 
 from ..sensor import PiKVMBaseSensor
-from ..utils import get_nested_value
 
 
 class PiKVMSDDriveSensor(PiKVMBaseSensor):
     """Representation of a PiKVM MSD drive sensor."""
 
+    _value_paths = {"drive": ("msd", "drive")}
+
     def __init__(self, coordinator, unique_id_base, device_name) -> None:
         """Initialize the sensor."""
         name = f"{device_name} MSD Drive"
         super().__init__(coordinator, unique_id_base, "msd_drive", name, icon="mdi:usb")
 
     @property
-    def state(self):
+    def native_value(self):
         """Return the state of the sensor."""
-        return get_nested_value(self.coordinator.data, ["msd", "drive", "connected"], False)
+        return self._value("drive", {}).get("connected", False)
 
-    @property
-    def extra_state_attributes(self):
+    def _compute_attributes(self):
         """Return the state attributes."""
-        attributes = super().extra_state_attributes
-        drive_data = get_nested_value(self.coordinator.data, ["msd", "drive"], {})
+        attributes = super()._compute_attributes()
+        drive_data = self._value("drive")
         if drive_data:
             attributes.update(drive_data)
         return attributes
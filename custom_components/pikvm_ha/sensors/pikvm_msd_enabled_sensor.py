@@ -5,12 +5,11 @@ from homeassistant.const import EntityCategory
 from ..sensor import PiKVMBaseSensor
 
 
-from ..utils import get_nested_value
-
-
 class PiKVMSDEnabledSensor(PiKVMBaseSensor):
     """Representation of a PiKVM MSD enabled sensor."""
 
+    _value_paths = {"enabled": ("msd", "enabled")}
+
     def __init__(self, coordinator, unique_id_base, device_name) -> None:
         """Initialize the sensor."""
         name = f"{device_name} MSD Enabled"
@@ -24,6 +23,6 @@ class PiKVMSDEnabledSensor(PiKVMBaseSensor):
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
     @property
-    def state(self) -> bool:
+    def native_value(self) -> bool:
         """Return the state of the sensor."""
-        return get_nested_value(self.coordinator.data, ["msd", "enabled"], False)
+        return self._value("enabled", False)
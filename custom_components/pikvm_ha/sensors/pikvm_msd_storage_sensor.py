@@ -1,16 +1,29 @@
 """Support for PiKVM MSD storage sensor."""
 
+import heapq
 import logging
 
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import PERCENTAGE
+
 from ..sensor import PiKVMBaseSensor
-from ..utils import get_nested_value
+from ..utils import bytes_to_mb
 
 _LOGGER = logging.getLogger(__name__)
 
+LARGEST_IMAGES = 5
+
 
 class PiKVMSDStorageSensor(PiKVMBaseSensor):
     """Representation of a PiKVM MSD storage sensor."""
 
+    _value_paths = {"storage": ("msd", "storage")}
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    # Change with every write or upload; the state already records usage
+    _unrecorded_attributes = frozenset(
+        {"free_size_mb", "used_size_mb", "percent_free", "largest_images"}
+    )
+
     def __init__(self, coordinator, unique_id_base, device_name) -> None:
         """Initialize the sensor."""
         name = f"{device_name} MSD Storage"
@@ -19,25 +32,31 @@ class PiKVMSDStorageSensor(PiKVMBaseSensor):
             unique_id_base,
             "msd_storage",
             name,
-            "%",
+            PERCENTAGE,
             "mdi:database",
         )
 
-    @property
-    def state(self):
-        storage = get_nested_value(self.coordinator.data, ["msd", "storage"], {})
+    @staticmethod
+    def _percent_free(storage):
         total = storage.get("size")
         free = storage.get("free")
         if total is None or free is None or total <= 0:
-            _LOGGER.debug("MSD storage data missing or invalid: %r", storage)
-            return None  # marks sensor unavailable
+            return None
         return round((free / total) * 100, 2)
 
     @property
-    def extra_state_attributes(self):
+    def native_value(self):
+        """Return the percentage of free storage."""
+        storage = self._value("storage", {})
+        percent_free = self._percent_free(storage)
+        if percent_free is None:
+            _LOGGER.debug("MSD storage data missing or invalid: %r", storage)
+        return percent_free
+
+    def _compute_attributes(self):
         """Return the state attributes."""
-        attributes = super().extra_state_attributes
-        storage_data = get_nested_value(self.coordinator.data, ["msd", "storage"], {})
+        attributes = super()._compute_attributes()
+        storage_data = self._value("storage", {})
         images = storage_data.get("images", {}) or {}
 
         if storage_data:
@@ -49,16 +68,21 @@ class PiKVMSDStorageSensor(PiKVMBaseSensor):
                 attributes["free_size_mb"] = round(free / (1024 * 1024), 2)
             if size is not None and free is not None:
                 attributes["used_size_mb"] = round((size - free) / (1024 * 1024), 2)
-            state = self.state
-            if state is not None:
-                attributes["percent_free"] = state
+            percent_free = self._percent_free(storage_data)
+            if percent_free is not None:
+                attributes["percent_free"] = percent_free
 
-        if images:
-            if len(images) < 20:
-                for image, details in images.items():
-                    size = details.get("size")
-                    if size is not None:
-                        attributes[image] = size
-            else:
-                attributes["file count"] = len(images)
+        # A fixed set of attributes, whatever the number of images; the full
+        # list is available from the msd_list_images service.
+        sizes = [
+            (details.get("size") or 0, name) for name, details in images.items()
+        ]
+        attributes["image_count"] = len(sizes)
+        attributes["images_size_mb"] = round(
+            bytes_to_mb(sum(size for size, _ in sizes)), 2
+        )
+        attributes["largest_images"] = {
+            name: round(bytes_to_mb(size), 2)
+            for size, name in heapq.nlargest(LARGEST_IMAGES, sizes)
+        }
         return attributes
@@ -0,0 +1,49 @@
+"""Support for PiKVM MSD image transfer progress sensor."""
+
+from homeassistant.const import PERCENTAGE
+
+from ..msd import MSD_TRANSFER_EVENT
+from ..sensor import PiKVMBaseSensor
+
+
+class PiKVMSDUploadSensor(PiKVMBaseSensor):
+    """Representation of the progress of an image transfer to the MSD."""
+
+    _push_events = (MSD_TRANSFER_EVENT,)
+    _unrecorded_attributes = frozenset({"sent_mb", "throughput_mb_s"})
+
+    def __init__(self, coordinator, unique_id_base, device_name) -> None:
+        """Initialize the sensor."""
+        name = f"{device_name} MSD Upload"
+        super().__init__(
+            coordinator,
+            unique_id_base,
+            "msd_upload",
+            name,
+            PERCENTAGE,
+            "mdi:upload",
+        )
+
+    @property
+    def native_value(self):
+        """Return the completed percentage of the last transfer."""
+        transfer = self.coordinator.msd_transfer
+        if transfer is None:
+            return None
+        return transfer.percent
+
+    def _compute_attributes(self):
+        """Return the state attributes."""
+        attributes = super()._compute_attributes()
+        transfer = self.coordinator.msd_transfer
+        if transfer is not None:
+            attributes["image"] = transfer.image
+            attributes["status"] = transfer.status
+            attributes["sent_mb"] = round(transfer.sent / (1024 * 1024), 2)
+            attributes["total_mb"] = round(transfer.total / (1024 * 1024), 2)
+            attributes["throughput_mb_s"] = round(
+                transfer.throughput / (1024 * 1024), 2
+            )
+            if transfer.error:
+                attributes["error"] = transfer.error
+        return attributes
@@ -0,0 +1,122 @@
+"""Support for PiKVM video streamer telemetry sensors.
+
+The values change several times per second during a KVM session, so they are
+taken from streamer_state pushes and written at most once per second.
+"""
+
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import PERCENTAGE
+
+from ..const import STREAMER_WRITE_INTERVAL
+from ..sensor import PiKVMBaseSensor
+from ..utils import get_nested_value
+
+
+class PiKVMStreamerSensor(PiKVMBaseSensor):
+    """Base class for a sensor reading the pushed streamer state."""
+
+    _push_events = ("streamer",)
+    _push_min_interval = STREAMER_WRITE_INTERVAL
+
+    def _get_streamer_value(self, keys, default=None):
+        return get_nested_value(self.coordinator.push_state, ["streamer", *keys], default)
+
+
+class PiKVMStreamerResolutionSensor(PiKVMStreamerSensor):
+    """Representation of the resolution of the captured video source."""
+
+    def __init__(self, coordinator, unique_id_base, device_name) -> None:
+        """Initialize the sensor."""
+        name = f"{device_name} Video Resolution"
+        super().__init__(
+            coordinator, unique_id_base, "streamer_resolution", name, icon="mdi:monitor"
+        )
+
+    @property
+    def native_value(self):
+        """Return the source resolution as WIDTHxHEIGHT."""
+        resolution = self._get_streamer_value(["streamer", "source", "resolution"])
+        if not resolution:
+            return None
+        return f"{resolution.get('width')}x{resolution.get('height')}"
+
+
+class PiKVMStreamerFpsSensor(PiKVMStreamerSensor):
+    """Representation of the frame rate captured from the video source."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, unique_id_base, device_name) -> None:
+        """Initialize the sensor."""
+        name = f"{device_name} Video FPS"
+        super().__init__(
+            coordinator, unique_id_base, "streamer_fps", name, "fps", "mdi:filmstrip"
+        )
+
+    @property
+    def native_value(self):
+        """Return the captured frames per second."""
+        return self._get_streamer_value(["streamer", "source", "captured_fps"])
+
+    def _compute_attributes(self):
+        """Return the state attributes."""
+        attributes = super()._compute_attributes()
+        desired_fps = self._get_streamer_value(["streamer", "source", "desired_fps"])
+        if desired_fps is not None:
+            attributes["desired_fps"] = desired_fps
+        return attributes
+
+
+class PiKVMStreamerQualitySensor(PiKVMStreamerSensor):
+    """Representation of the JPEG quality of the video encoder."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, unique_id_base, device_name) -> None:
+        """Initialize the sensor."""
+        name = f"{device_name} Video Quality"
+        super().__init__(
+            coordinator,
+            unique_id_base,
+            "streamer_quality",
+            name,
+            PERCENTAGE,
+            "mdi:quality-high",
+        )
+
+    @property
+    def native_value(self):
+        """Return the encoder quality."""
+        return self._get_streamer_value(["streamer", "encoder", "quality"])
+
+    def _compute_attributes(self):
+        """Return the state attributes."""
+        attributes = super()._compute_attributes()
+        encoder = self._get_streamer_value(["streamer", "encoder", "type"])
+        if encoder is not None:
+            attributes["encoder"] = encoder
+        return attributes
+
+
+class PiKVMStreamerClientsSensor(PiKVMStreamerSensor):
+    """Representation of the number of clients watching the video stream."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, unique_id_base, device_name) -> None:
+        """Initialize the sensor."""
+        name = f"{device_name} Video Viewers"
+        super().__init__(
+            coordinator,
+            unique_id_base,
+            "streamer_clients",
+            name,
+            icon="mdi:account-eye",
+        )
+
+    @property
+    def native_value(self):
+        """Return the number of connected viewers."""
+        if not self._get_streamer_value(["streamer"]):
+            return 0 if "streamer" in self.coordinator.push_state else None
+        return self._get_streamer_value(["streamer", "stream", "clients"], 0)
@@ -1,12 +1,13 @@
 """Support for PiKVM throttling sensor."""
 
 from ..sensor import PiKVMBaseSensor
-from ..utils import get_nested_value
 
 
 class PiKVMThrottlingSensor(PiKVMBaseSensor):
     """Representation of a PiKVM throttling sensor."""
 
+    _value_paths = {"throttling": ("hw", "health", "throttling")}
+
     def __init__(self, coordinator, unique_id_base, device_name) -> None:
         """Initialize the sensor."""
         name = f"{device_name} Throttling"
@@ -19,17 +20,14 @@ class PiKVMThrottlingSensor(PiKVMBaseSensor):
         )
 
     @property
-    def state(self):
+    def native_value(self):
         """Return the state of the sensor."""
-        health = get_nested_value(self.coordinator.data, ["hw", "health"], {})
-        return health.get("throttling", {}).get("raw_flags", 0)
+        return self._value("throttling", {}).get("raw_flags", 0)
 
-    @property
-    def extra_state_attributes(self) -> dict:
+    def _compute_attributes(self) -> dict:
         """Return the state attributes."""
-        health = get_nested_value(self.coordinator.data, ["hw", "health"], {})
-        throttling_data = health.get("throttling", {})
-        flattened_data = {}
+        throttling_data = self._value("throttling", {})
+        flattened_data = super()._compute_attributes()
         for key, value in throttling_data.items():
             if isinstance(value, dict):
                 for sub_key, sub_value in value.items():
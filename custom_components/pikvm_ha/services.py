@@ -0,0 +1,566 @@
+"""Services for the PiKVM integration."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import os
+import time
+from urllib.parse import unquote, urlparse
+
+import voluptuous as vol
+
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import discovery_flow
+import homeassistant.helpers.config_validation as cv
+
+from .const import CONF_SERIAL, DEFAULT_PASSWORD, DEFAULT_USERNAME, DOMAIN
+from .coordinator import PiKVMDataUpdateCoordinator, PiKVMRequestError
+from .hid import (
+    DEFAULT_KEY_DELAY,
+    async_send_key_events,
+    async_type_text,
+    combo_to_key_events,
+)
+from .msd import (
+    BandwidthLimiter,
+    async_cancel_transfer,
+    async_distribute_image,
+    async_distribute_remote,
+    async_get_file_size,
+    async_iter_file,
+    async_run_transfer,
+    async_upload_image,
+)
+from .entry_index import async_get_serial_index
+from .msd_index import async_get_device_images, async_get_image_index
+from .scanner import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT,
+    async_scan_networks,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_ACTION = "action"
+ATTR_CHANNEL = "channel"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CONFIG_ENTRY_IDS = "config_entry_ids"
+ATTR_DELAY = "delay"
+ATTR_FORCE = "force"
+ATTR_IMAGE = "image"
+ATTR_KEYS = "keys"
+ATTR_MAX_CONCURRENT = "max_concurrent"
+ATTR_MAX_RATE = "max_rate"
+ATTR_NETWORKS = "networks"
+ATTR_PASSWORD = "password"
+ATTR_PATH = "path"
+ATTR_TEXT = "text"
+ATTR_TIMEOUT = "timeout"
+ATTR_URL = "url"
+ATTR_USERNAME = "username"
+
+SERVICE_BULK_ACTION = "bulk_action"
+SERVICE_MSD_DISTRIBUTE = "msd_distribute"
+SERVICE_MSD_DOWNLOAD = "msd_download"
+SERVICE_MSD_LIST_IMAGES = "msd_list_images"
+SERVICE_MSD_UPLOAD = "msd_upload"
+SERVICE_MSD_UPLOAD_CANCEL = "msd_upload_cancel"
+SERVICE_SCAN_NETWORK = "scan_network"
+SERVICE_SEND_KEYS = "send_keys"
+SERVICE_TYPE_TEXT = "type_text"
+
+TYPE_TEXT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_TEXT): cv.string,
+        vol.Optional(ATTR_DELAY, default=DEFAULT_KEY_DELAY): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+    }
+)
+
+SEND_KEYS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_KEYS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_DELAY, default=DEFAULT_KEY_DELAY): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+    }
+)
+
+MSD_UPLOAD_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_IMAGE): cv.string,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+        # Megabytes per second, 0 for unlimited
+        vol.Optional(ATTR_MAX_RATE, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+MSD_UPLOAD_CANCEL_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+MSD_LIST_IMAGES_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+MSD_DISTRIBUTE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_IDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_IMAGE): cv.string,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+        vol.Optional(ATTR_MAX_CONCURRENT, default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        # Combined megabytes per second across all devices, 0 for unlimited
+        vol.Optional(ATTR_MAX_RATE, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+MSD_DOWNLOAD_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_IDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_URL): cv.url,
+        vol.Optional(ATTR_IMAGE): cv.string,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+        vol.Optional(ATTR_MAX_CONCURRENT, default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        # Seconds kvmd waits for the remote server to respond
+        vol.Optional(ATTR_TIMEOUT, default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=3600)
+        ),
+    }
+)
+
+
+# Actions of bulk_action: action -> (coroutine factory, required field)
+BULK_ACTIONS: dict[
+    str,
+    tuple[Callable[[PiKVMDataUpdateCoordinator, dict], Awaitable[None]], str | None],
+] = {
+    "atx_power_on": (lambda coordinator, _: coordinator.async_atx_power("on"), None),
+    "atx_power_off": (lambda coordinator, _: coordinator.async_atx_power("off"), None),
+    "atx_power_off_hard": (
+        lambda coordinator, _: coordinator.async_atx_power("off_hard"),
+        None,
+    ),
+    "atx_reset_hard": (
+        lambda coordinator, _: coordinator.async_atx_power("reset_hard"),
+        None,
+    ),
+    "atx_click_power": (lambda coordinator, _: coordinator.async_atx_click("power"), None),
+    "atx_click_power_long": (
+        lambda coordinator, _: coordinator.async_atx_click("power_long"),
+        None,
+    ),
+    "atx_click_reset": (lambda coordinator, _: coordinator.async_atx_click("reset"), None),
+    "msd_connect": (lambda coordinator, _: coordinator.async_msd_set_connected(True), None),
+    "msd_disconnect": (
+        lambda coordinator, _: coordinator.async_msd_set_connected(False),
+        None,
+    ),
+    "msd_select_image": (
+        lambda coordinator, data: coordinator.async_msd_set_image(data[ATTR_IMAGE]),
+        ATTR_IMAGE,
+    ),
+    "gpio_switch_on": (
+        lambda coordinator, data: coordinator.async_gpio_switch(data[ATTR_CHANNEL], True),
+        ATTR_CHANNEL,
+    ),
+    "gpio_switch_off": (
+        lambda coordinator, data: coordinator.async_gpio_switch(data[ATTR_CHANNEL], False),
+        ATTR_CHANNEL,
+    ),
+    "gpio_pulse": (
+        lambda coordinator, data: coordinator.async_gpio_pulse(data[ATTR_CHANNEL]),
+        ATTR_CHANNEL,
+    ),
+}
+
+BULK_ACTION_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_IDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_ACTION): vol.In(BULK_ACTIONS),
+        vol.Optional(ATTR_CHANNEL): cv.string,
+        vol.Optional(ATTR_IMAGE): cv.string,
+        vol.Optional(ATTR_MAX_CONCURRENT, default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        # Seconds allowed per device before it is reported as failed
+        vol.Optional(ATTR_TIMEOUT, default=30): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+    }
+)
+
+
+SCAN_NETWORK_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_NETWORKS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_USERNAME, default=DEFAULT_USERNAME): cv.string,
+        vol.Optional(ATTR_PASSWORD, default=DEFAULT_PASSWORD): cv.string,
+        vol.Optional(ATTR_MAX_CONCURRENT, default=DEFAULT_MAX_CONCURRENT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1024)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_CONNECT_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=10)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> PiKVMDataUpdateCoordinator:
+    """Return the coordinator of a loaded config entry."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+    if coordinator is None:
+        raise ServiceValidationError(f"PiKVM config entry {entry_id} is not loaded")
+    return coordinator
+
+
+async def _async_type_text(call: ServiceCall) -> None:
+    coordinator = _get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    try:
+        await async_type_text(coordinator, call.data[ATTR_TEXT], call.data[ATTR_DELAY])
+    except ValueError as err:
+        raise ServiceValidationError(str(err)) from err
+    except (ConnectionError, TimeoutError, PiKVMRequestError) as err:
+        raise HomeAssistantError(f"Failed to type text: {err}") from err
+
+
+async def _async_send_keys(call: ServiceCall) -> None:
+    coordinator = _get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    try:
+        events = [
+            event for combo in call.data[ATTR_KEYS] for event in combo_to_key_events(combo)
+        ]
+    except ValueError as err:
+        raise ServiceValidationError(str(err)) from err
+    try:
+        await async_send_key_events(coordinator, events, call.data[ATTR_DELAY])
+    except (ConnectionError, TimeoutError, PiKVMRequestError) as err:
+        raise HomeAssistantError(f"Failed to send keys: {err}") from err
+
+
+async def _async_validate_source(hass: HomeAssistant, path: str) -> int:
+    """Check that a source image may be read and return its size."""
+    if not hass.config.is_allowed_path(path):
+        raise ServiceValidationError(f"Access to {path} is not allowed")
+    try:
+        return await async_get_file_size(hass, path)
+    except OSError as err:
+        raise ServiceValidationError(f"Cannot read {path}: {err}") from err
+
+
+def _get_limiter(call: ServiceCall) -> BandwidthLimiter | None:
+    max_rate = call.data[ATTR_MAX_RATE]
+    return BandwidthLimiter(max_rate * 1024 * 1024) if max_rate else None
+
+
+async def _async_msd_upload(call: ServiceCall) -> None:
+    coordinator = _get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    path = call.data[ATTR_PATH]
+    image = call.data.get(ATTR_IMAGE) or os.path.basename(path)
+    await _async_validate_source(call.hass, path)
+    index = await async_get_image_index(call.hass)
+    try:
+        size, sha256 = await index.async_hash_file(path)
+        if not await index.async_prepare_upload(
+            coordinator, image, size, sha256, call.data[ATTR_FORCE]
+        ):
+            return
+        await async_run_transfer(
+            coordinator,
+            async_upload_image(
+                coordinator,
+                async_iter_file(call.hass, path),
+                image,
+                size,
+                _get_limiter(call),
+            ),
+        )
+    except PiKVMRequestError as err:
+        raise HomeAssistantError(str(err)) from err
+    except asyncio.CancelledError as err:
+        # msd_upload_cancel cancels the transfer, not this service call
+        if asyncio.current_task().cancelling():
+            raise
+        raise HomeAssistantError("Upload cancelled") from err
+    index.async_record_upload(coordinator, image, size, sha256)
+
+
+async def _async_msd_distribute(call: ServiceCall) -> ServiceResponse:
+    coordinators = {
+        entry_id: _get_coordinator(call.hass, entry_id)
+        for entry_id in call.data[ATTR_CONFIG_ENTRY_IDS]
+    }
+    path = call.data[ATTR_PATH]
+    image = call.data.get(ATTR_IMAGE) or os.path.basename(path)
+    await _async_validate_source(call.hass, path)
+    index = await async_get_image_index(call.hass)
+    size, sha256 = await index.async_hash_file(path)
+
+    results: dict[str, dict] = {}
+    pending = {}
+    semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENT])
+
+    async def _async_prepare(entry_id: str, coordinator) -> None:
+        async with semaphore:
+            try:
+                if await index.async_prepare_upload(
+                    coordinator, image, size, sha256, call.data[ATTR_FORCE]
+                ):
+                    pending[entry_id] = coordinator
+                else:
+                    results[entry_id] = {"success": True, "skipped": True}
+            except PiKVMRequestError as err:
+                results[entry_id] = {"success": False, "error": str(err)}
+
+    await asyncio.gather(
+        *(_async_prepare(entry_id, coordinator) for entry_id, coordinator in coordinators.items())
+    )
+
+    if pending:
+        uploaded = await async_distribute_image(
+            call.hass,
+            pending,
+            path,
+            image,
+            call.data[ATTR_MAX_CONCURRENT],
+            _get_limiter(call),
+        )
+        for entry_id, result in uploaded.items():
+            if result["success"]:
+                index.async_record_upload(pending[entry_id], image, size, sha256)
+        results.update(uploaded)
+
+    failed = [entry_id for entry_id, result in results.items() if not result["success"]]
+    if failed:
+        _LOGGER.warning("MSD distribution failed for %s of %s devices", len(failed), len(results))
+    return {"results": results}
+
+
+async def _async_msd_download(call: ServiceCall) -> ServiceResponse:
+    coordinators = {
+        entry_id: _get_coordinator(call.hass, entry_id)
+        for entry_id in call.data[ATTR_CONFIG_ENTRY_IDS]
+    }
+    url = call.data[ATTR_URL]
+    image = call.data.get(ATTR_IMAGE) or os.path.basename(unquote(urlparse(url).path))
+    if not image:
+        raise ServiceValidationError(f"Cannot derive an image name from {url}")
+    index = await async_get_image_index(call.hass)
+
+    results: dict[str, dict] = {}
+    pending = {}
+    semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENT])
+
+    async def _async_prepare(entry_id: str, coordinator) -> None:
+        # Without a local copy there is no hash to compare, so an existing
+        # image with the same name is only replaced when forced.
+        async with semaphore:
+            try:
+                name_taken = image in await async_get_device_images(coordinator)
+                if name_taken and not call.data[ATTR_FORCE]:
+                    results[entry_id] = {"success": True, "skipped": True}
+                    return
+                if name_taken:
+                    await coordinator.async_msd_remove_image(image)
+                pending[entry_id] = coordinator
+            except PiKVMRequestError as err:
+                results[entry_id] = {"success": False, "error": str(err)}
+
+    await asyncio.gather(
+        *(_async_prepare(entry_id, coordinator) for entry_id, coordinator in coordinators.items())
+    )
+
+    if pending:
+        downloaded = await async_distribute_remote(
+            pending,
+            url,
+            image,
+            call.data[ATTR_TIMEOUT],
+            call.data[ATTR_MAX_CONCURRENT],
+        )
+        for entry_id, result in downloaded.items():
+            if result["success"]:
+                index.async_forget_image(pending[entry_id], image)
+        results.update(downloaded)
+
+    failed = [entry_id for entry_id, result in results.items() if not result["success"]]
+    if failed:
+        _LOGGER.warning("MSD download failed for %s of %s devices", len(failed), len(results))
+    return {"results": results}
+
+
+async def _async_bulk_action(call: ServiceCall) -> ServiceResponse:
+    action, required = BULK_ACTIONS[call.data[ATTR_ACTION]]
+    if required is not None and not call.data.get(required):
+        raise ServiceValidationError(
+            f"Action {call.data[ATTR_ACTION]} requires the {required} field"
+        )
+    semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENT])
+    results: dict[str, dict] = {}
+
+    async def _async_run(entry_id: str) -> None:
+        coordinator = call.hass.data.get(DOMAIN, {}).get(entry_id)
+        if coordinator is None:
+            results[entry_id] = {"success": False, "error": "not loaded"}
+            return
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                async with asyncio.timeout(call.data[ATTR_TIMEOUT]):
+                    await action(coordinator, call.data)
+            except TimeoutError:
+                result = {"success": False, "error": "timed out"}
+            except PiKVMRequestError as err:
+                result = {"success": False, "error": str(err)}
+            else:
+                result = {"success": True}
+            result["duration"] = round(time.monotonic() - start, 2)
+            results[entry_id] = result
+
+    # dict.fromkeys drops duplicate entries while keeping their order
+    entry_ids = list(dict.fromkeys(call.data[ATTR_CONFIG_ENTRY_IDS]))
+    await asyncio.gather(*(_async_run(entry_id) for entry_id in entry_ids))
+
+    failed = {
+        entry_id: result["error"]
+        for entry_id, result in results.items()
+        if not result["success"]
+    }
+    if failed:
+        _LOGGER.warning(
+            "Bulk action %s failed for %s of %s devices",
+            call.data[ATTR_ACTION],
+            len(failed),
+            len(results),
+        )
+    return {
+        "succeeded": [entry_id for entry_id in entry_ids if results[entry_id]["success"]],
+        "failed": failed,
+        "results": results,
+    }
+
+
+async def _async_msd_list_images(call: ServiceCall) -> ServiceResponse:
+    coordinator = _get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    try:
+        images = await async_get_device_images(coordinator)
+    except PiKVMRequestError as err:
+        raise HomeAssistantError(f"Failed to list MSD images: {err}") from err
+    return {
+        "images": [
+            {
+                "name": name,
+                "size": details.get("size"),
+                "complete": details.get("complete", True),
+                "modified": details.get("mod_ts"),
+            }
+            for name, details in sorted(images.items())
+        ]
+    }
+
+
+async def _async_msd_upload_cancel(call: ServiceCall) -> None:
+    coordinator = _get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    if not async_cancel_transfer(coordinator):
+        _LOGGER.debug("No MSD transfer running for %s", coordinator.url)
+
+
+async def _async_scan_network(call: ServiceCall) -> ServiceResponse:
+    hass = call.hass
+    try:
+        devices = await async_scan_networks(
+            hass,
+            call.data[ATTR_NETWORKS],
+            call.data[ATTR_USERNAME],
+            call.data[ATTR_PASSWORD],
+            call.data[ATTR_MAX_CONCURRENT],
+            call.data[ATTR_TIMEOUT],
+        )
+    except ValueError as err:
+        raise ServiceValidationError(str(err)) from err
+
+    index = async_get_serial_index(hass)
+    for device in devices:
+        device["configured"] = index.async_get_entry(device[CONF_SERIAL]) is not None
+        # Devices that did not accept the credentials can still be added by hand
+        if device[CONF_SERIAL]:
+            discovery_flow.async_create_flow(
+                hass,
+                DOMAIN,
+                context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                data=device,
+            )
+    _LOGGER.debug("Network scan found %s PiKVMs", len(devices))
+    return {"devices": devices}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the PiKVM services."""
+    hass.services.async_register(
+        DOMAIN, SERVICE_TYPE_TEXT, _async_type_text, schema=TYPE_TEXT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_KEYS, _async_send_keys, schema=SEND_KEYS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_MSD_UPLOAD, _async_msd_upload, schema=MSD_UPLOAD_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MSD_DISTRIBUTE,
+        _async_msd_distribute,
+        schema=MSD_DISTRIBUTE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MSD_DOWNLOAD,
+        _async_msd_download,
+        schema=MSD_DOWNLOAD_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_ACTION,
+        _async_bulk_action,
+        schema=BULK_ACTION_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MSD_LIST_IMAGES,
+        _async_msd_list_images,
+        schema=MSD_LIST_IMAGES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MSD_UPLOAD_CANCEL,
+        _async_msd_upload_cancel,
+        schema=MSD_UPLOAD_CANCEL_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SCAN_NETWORK,
+        _async_scan_network,
+        schema=SCAN_NETWORK_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,71 @@
+"""Flat per-update snapshot of the values read by the PiKVM sensors.
+
+Sensors declare the paths they read from the coordinator data. The paths are
+compiled once into accessors, and every coordinator update is turned into a
+single snapshot object with one ``__slots__`` field per distinct path. Entity
+properties then read an attribute instead of walking nested dicts each time
+Home Assistant asks for a state or its attributes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import Any
+
+Accessor = Callable[[Any], Any]
+
+
+def compile_path(keys: Sequence[str]) -> Accessor:
+    """Compile a key path into a function returning the value or None.
+
+    Like get_nested_value, a missing key, a non-dict on the way or an empty
+    dict at the end yields None.
+    """
+    keys = tuple(keys)
+
+    def accessor(data: Any) -> Any:
+        try:
+            for key in keys:
+                data = data[key]
+        except (KeyError, TypeError):
+            return None
+        return None if data == {} else data
+
+    return accessor
+
+
+class SnapshotSchema:
+    """The set of paths read by the sensors of one coordinator."""
+
+    def __init__(self) -> None:
+        """Initialize an empty schema."""
+        self._slots: dict[tuple[str, ...], str] = {}
+        self._accessors: list[tuple[str, Accessor]] = []
+        self._snapshot_class: type | None = None
+
+    @property
+    def version(self) -> int:
+        """Return a number that changes whenever a path is added."""
+        return len(self._slots)
+
+    def register(self, keys: Sequence[str]) -> str:
+        """Register a path and return the snapshot attribute holding its value."""
+        keys = tuple(keys)
+        slot = self._slots.get(keys)
+        if slot is None:
+            slot = f"v{len(self._slots)}"
+            self._slots[keys] = slot
+            self._accessors.append((slot, compile_path(keys)))
+            self._snapshot_class = None
+        return slot
+
+    def build(self, data: Any) -> Any:
+        """Evaluate every registered path against the coordinator data."""
+        if self._snapshot_class is None:
+            self._snapshot_class = type(
+                "PiKVMSnapshot", (), {"__slots__": tuple(self._slots.values())}
+            )
+        snapshot = self._snapshot_class()
+        for slot, accessor in self._accessors:
+            setattr(snapshot, slot, accessor(data))
+        return snapshot
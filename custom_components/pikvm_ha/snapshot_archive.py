@@ -0,0 +1,313 @@
+"""Deduplicated on-disk archive of PiKVM video snapshots.
+
+Snapshots are stored once per unique frame, addressed by a BLAKE2b digest of
+the JPEG payload, and shared between devices. Each device keeps a compact
+binary timeline of fixed-size records ``(first_seen, last_seen, digest)``.
+Consecutive identical frames (a static BIOS screen or a sleeping display)
+only extend the ``last_seen`` field of the newest record, so an idle night
+costs a single record instead of thousands.
+
+Layout below ``<config>/pikvm_ha_snapshots``::
+
+    objects/ab/cdef0123...   JPEG payloads keyed by digest
+    index/<device>.idx       24-byte timeline records per device
+
+All disk I/O happens in the executor, in batches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import timedelta
+import hashlib
+import logging
+import os
+import re
+import struct
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import SNAPSHOT_ARCHIVE_DIR
+
+_LOGGER = logging.getLogger(__name__)
+
+DIGEST_SIZE = 16
+INDEX_RECORD = struct.Struct(f"<II{DIGEST_SIZE}s")
+FLUSH_INTERVAL = timedelta(seconds=60)
+PRUNE_INTERVAL = timedelta(hours=1)
+MAX_PENDING = 32
+
+
+def snapshot_digest(data: bytes) -> bytes:
+    """Return the content address of a snapshot payload."""
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def _device_key(device: str) -> str:
+    """Return a filesystem-safe key for a device identifier."""
+    return re.sub(r"[^a-zA-Z0-9_.-]", "_", device.lower())
+
+
+@dataclass(slots=True)
+class PendingSnapshot:
+    """A snapshot waiting to be written to disk."""
+
+    device: str
+    timestamp: int
+    digest: bytes
+    data: bytes | None
+
+
+@dataclass(slots=True)
+class RetentionPolicy:
+    """Retention limits applied to a single device timeline."""
+
+    max_age: int
+    max_bytes: int
+
+
+class SnapshotArchiveStore:
+    """Blocking, content-addressed snapshot storage.
+
+    Every method in this class performs disk I/O and must be called from the
+    executor.
+    """
+
+    def __init__(self, root: str) -> None:
+        """Initialize the store rooted at the given directory."""
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_dir = os.path.join(root, "index")
+
+    def _object_path(self, digest: bytes) -> str:
+        hexdigest = digest.hex()
+        return os.path.join(self.objects_dir, hexdigest[:2], hexdigest[2:])
+
+    def _index_path(self, device: str) -> str:
+        return os.path.join(self.index_dir, f"{_device_key(device)}.idx")
+
+    def write_batch(self, batch: list[PendingSnapshot]) -> None:
+        """Persist a batch of snapshots and extend the device timelines."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        for item in batch:
+            if item.data is not None:
+                self._write_object(item.digest, item.data)
+            self._append_record(item.device, item.timestamp, item.digest)
+
+    def _write_object(self, digest: bytes, data: bytes) -> None:
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    def _append_record(self, device: str, timestamp: int, digest: bytes) -> None:
+        path = self._index_path(device)
+        with open(path, "ab+") as file:
+            size = file.seek(0, os.SEEK_END)
+            if size >= INDEX_RECORD.size:
+                file.seek(size - INDEX_RECORD.size)
+                first_seen, _, last_digest = INDEX_RECORD.unpack(
+                    file.read(INDEX_RECORD.size)
+                )
+                if last_digest == digest:
+                    # Same frame as before: only move the end of the run.
+                    file.truncate(size - INDEX_RECORD.size)
+                    file.write(INDEX_RECORD.pack(first_seen, timestamp, digest))
+                    return
+            file.write(INDEX_RECORD.pack(timestamp, timestamp, digest))
+
+    def read_index(self, device: str) -> list[tuple[int, int, bytes]]:
+        """Return the timeline records of a device, oldest first."""
+        try:
+            with open(self._index_path(device), "rb") as file:
+                raw = file.read()
+        except FileNotFoundError:
+            return []
+        usable = len(raw) - len(raw) % INDEX_RECORD.size
+        return list(INDEX_RECORD.iter_unpack(raw[:usable]))
+
+    def _write_index(self, device: str, records: list[tuple[int, int, bytes]]) -> None:
+        path = self._index_path(device)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(b"".join(INDEX_RECORD.pack(*record) for record in records))
+        os.replace(tmp_path, path)
+
+    def _object_size(self, digest: bytes) -> int:
+        try:
+            return os.path.getsize(self._object_path(digest))
+        except OSError:
+            return 0
+
+    def prune(self, policies: dict[str, RetentionPolicy], now: int) -> set[str]:
+        """Apply the retention policies and drop unreferenced objects.
+
+        Returns the devices whose newest record was removed.
+        """
+        truncated: set[str] = set()
+        for device, policy in policies.items():
+            records = self.read_index(device)
+            if not records:
+                continue
+            cutoff = now - policy.max_age
+            kept = [record for record in records if record[1] >= cutoff]
+
+            # Walk newest to oldest and stop once the size budget is spent.
+            seen: set[bytes] = set()
+            total = 0
+            start = len(kept)
+            for position in range(len(kept) - 1, -1, -1):
+                digest = kept[position][2]
+                if digest not in seen:
+                    size = self._object_size(digest)
+                    if total + size > policy.max_bytes:
+                        break
+                    seen.add(digest)
+                    total += size
+                start = position
+            kept = kept[start:]
+
+            if len(kept) != len(records):
+                _LOGGER.debug(
+                    "Pruned %s snapshot records for %s",
+                    len(records) - len(kept),
+                    device,
+                )
+                self._write_index(device, kept)
+                if not kept or kept[-1] != records[-1]:
+                    truncated.add(device)
+        self.collect_garbage()
+        return truncated
+
+    def collect_garbage(self) -> None:
+        """Remove objects that are no longer referenced by any timeline."""
+        if not os.path.isdir(self.objects_dir):
+            return
+        referenced: set[str] = set()
+        if os.path.isdir(self.index_dir):
+            for name in os.listdir(self.index_dir):
+                if name.endswith(".idx"):
+                    for _, _, digest in self.read_index(name[:-4]):
+                        referenced.add(digest.hex())
+        for prefix in os.listdir(self.objects_dir):
+            bucket = os.path.join(self.objects_dir, prefix)
+            for name in os.listdir(bucket):
+                # A .tmp file is an object still being written
+                if name.endswith(".tmp"):
+                    continue
+                if f"{prefix}{name}" not in referenced:
+                    os.remove(os.path.join(bucket, name))
+            if not os.listdir(bucket):
+                os.rmdir(bucket)
+
+
+class SnapshotArchive:
+    """Batch snapshots from all PiKVM devices into the on-disk store."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the archive."""
+        self.hass = hass
+        self.store = SnapshotArchiveStore(hass.config.path(SNAPSHOT_ARCHIVE_DIR))
+        self._pending: list[PendingSnapshot] = []
+        self._last_digest: dict[str, bytes] = {}
+        self._policies: dict[str, RetentionPolicy] = {}
+        self._unsub_flush = None
+        self._unsub_prune = None
+        # Garbage collection must not see the objects of a batch before its
+        # records, nor rewrite an index while records are appended to it
+        self._lock = asyncio.Lock()
+
+    @callback
+    def async_register(self, device: str, max_age_days: int, max_size_mb: int) -> None:
+        """Start archiving for a device with the given retention policy."""
+        self._policies[device] = RetentionPolicy(
+            max_age=max_age_days * 86400, max_bytes=max_size_mb * 1024 * 1024
+        )
+        if self._unsub_flush is None:
+            self._unsub_flush = async_track_time_interval(
+                self.hass, self._async_flush_interval, FLUSH_INTERVAL
+            )
+            self._unsub_prune = async_track_time_interval(
+                self.hass, self._async_prune_interval, PRUNE_INTERVAL
+            )
+
+    async def async_unregister(self, device: str) -> None:
+        """Stop archiving for a device and flush what is still pending."""
+        self._policies.pop(device, None)
+        self._last_digest.pop(device, None)
+        await self.async_flush()
+        if not self._policies and self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_prune()
+            self._unsub_flush = self._unsub_prune = None
+
+    @callback
+    def async_add(self, device: str, data: bytes) -> None:
+        """Queue a snapshot for the next batch write."""
+        digest = snapshot_digest(data)
+        duplicate = self._last_digest.get(device) == digest
+        self._last_digest[device] = digest
+        self._pending.append(
+            PendingSnapshot(device, int(time.time()), digest, None if duplicate else data)
+        )
+        if len(self._pending) >= MAX_PENDING:
+            self.hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Write all pending snapshots in one executor job."""
+        async with self._lock:
+            await self._async_write_pending()
+
+    async def _async_write_pending(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            await self.hass.async_add_executor_job(self.store.write_batch, batch)
+        except OSError as err:
+            _LOGGER.error("Failed to write PiKVM snapshot archive: %s", err)
+            self._forget_last_frames({item.device for item in batch})
+
+    def _forget_last_frames(self, devices: set[str]) -> None:
+        """Make the next frame of devices carry its data again.
+
+        Used when the last frame of a device may not be on disk, after a
+        failed write or once pruning removed it. Duplicates of it queued in
+        the meantime are dropped, as they would refer to a missing object.
+        """
+        for device in devices:
+            self._last_digest.pop(device, None)
+        self._pending = [
+            item
+            for item in self._pending
+            if item.data is not None or item.device not in devices
+        ]
+
+    async def async_prune(self) -> None:
+        """Apply retention to every registered device."""
+        async with self._lock:
+            await self._async_write_pending()
+            await self._async_prune()
+
+    async def _async_prune(self) -> None:
+        try:
+            truncated = await self.hass.async_add_executor_job(
+                self.store.prune, dict(self._policies), int(time.time())
+            )
+        except OSError as err:
+            _LOGGER.error("Failed to prune PiKVM snapshot archive: %s", err)
+            return
+        self._forget_last_frames(truncated)
+
+    async def _async_flush_interval(self, _now) -> None:
+        await self.async_flush()
+
+    async def _async_prune_interval(self, _now) -> None:
+        await self.async_prune()
@@ -0,0 +1,64 @@
+"""Last known state of a PiKVM, persisted so setup does not wait for the device.
+
+The data of the last successful update is saved per config entry. On the next
+start the entities are created from it right away, marked stale, while the
+first live update runs in the background. The device info is derived from the
+same data, so it is restored as well.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import PiKVMDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Data changes with every poll; saving it once a few minutes is enough
+SAVE_DELAY = 300
+
+
+class PiKVMStateCache:
+    """Persisted coordinator data of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.state_cache.{entry_id}"
+        )
+        self._data: dict[str, Any] | None = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the data of the last successful update, if any."""
+        stored = await self._store.async_load()
+        if not stored or not isinstance(stored.get("data"), dict):
+            return None
+        return stored["data"]
+
+    @callback
+    def async_track(self, coordinator: PiKVMDataUpdateCoordinator):
+        """Save the coordinator data after every live update.
+
+        Returns a callback that stops tracking.
+        """
+
+        @callback
+        def _async_update() -> None:
+            if coordinator.data is None or coordinator.stale:
+                return
+            self._data = coordinator.data
+            self._store.async_delay_save(lambda: {"data": self._data}, SAVE_DELAY)
+
+        return coordinator.async_add_listener(_async_update)
+
+    async def async_remove(self) -> None:
+        """Remove the cache of a deleted config entry."""
+        await self._store.async_remove()
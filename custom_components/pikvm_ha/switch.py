@@ -0,0 +1,158 @@
+"""Platform for switch integration."""
+
+import logging
+
+from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+from .coordinator import PiKVMRequestError
+from .entity import PiKVMEntity, PiKVMGpioEntity
+from .utils import (
+    get_device_name,
+    get_gpio_channels,
+    get_nested_value,
+    get_unique_id_base,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long an optimistic power state is shown before the LED state wins again.
+# Booting or shutting down an ATX host can take a while before the LED changes.
+ATX_OPTIMISTIC_TIMEOUT = 30
+
+
+class PiKVMAtxPowerSwitch(PiKVMEntity, SwitchEntity):
+    """Switch controlling the ATX power of the host attached to the PiKVM."""
+
+    _attr_device_class = SwitchDeviceClass.SWITCH
+    _push_events = ("atx",)
+
+    def __init__(self, coordinator, unique_id_base, device_name) -> None:
+        """Initialize the switch."""
+        super().__init__(coordinator, unique_id_base)
+        self._attr_unique_id = f"{unique_id_base}_atx_power"
+        self._attr_name = f"{device_name} ATX Power"
+        self._attr_icon = "mdi:power"
+        self._optimistic_state: bool | None = None
+        self._unsub_optimistic = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates and drop the optimistic timer on removal."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_optimistic)
+
+    @property
+    def available(self) -> bool:
+        """Return True if ATX control is enabled on the device."""
+        return super().available and get_nested_value(
+            self.coordinator.push_state, ["atx", "enabled"], False
+        )
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return the power LED state, or the optimistic state after a command."""
+        if self._optimistic_state is not None:
+            return self._optimistic_state
+        return get_nested_value(self.coordinator.push_state, ["atx", "leds", "power"])
+
+    async def async_turn_on(self, **kwargs) -> None:
+        """Power on the host."""
+        await self._async_set_power("on", True)
+
+    async def async_turn_off(self, **kwargs) -> None:
+        """Gracefully power off the host."""
+        await self._async_set_power("off", False)
+
+    async def _async_set_power(self, action: str, state: bool) -> None:
+        self._async_cancel_optimistic()
+        self._optimistic_state = state
+        self._unsub_optimistic = async_call_later(
+            self.hass, ATX_OPTIMISTIC_TIMEOUT, self._async_expire_optimistic
+        )
+        self.async_write_ha_state()
+        try:
+            await self.coordinator.async_atx_power(action)
+        except PiKVMRequestError as err:
+            self._async_cancel_optimistic()
+            self._optimistic_state = None
+            self.async_write_ha_state()
+            raise HomeAssistantError(f"Failed to set ATX power {action}: {err}") from err
+
+    @callback
+    def _handle_push_update(self) -> None:
+        """Drop the optimistic state once the power LED confirms it."""
+        power = get_nested_value(self.coordinator.push_state, ["atx", "leds", "power"])
+        if power == self._optimistic_state:
+            self._async_cancel_optimistic()
+            self._optimistic_state = None
+        super()._handle_push_update()
+
+    @callback
+    def _async_expire_optimistic(self, _now) -> None:
+        """Show the power LED state again when it never confirmed the command."""
+        self._unsub_optimistic = None
+        self._optimistic_state = None
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_optimistic(self) -> None:
+        if self._unsub_optimistic is not None:
+            self._unsub_optimistic()
+            self._unsub_optimistic = None
+
+
+class PiKVMGpioSwitch(PiKVMGpioEntity, SwitchEntity):
+    """Switch controlling a GPIO output channel, such as a relay or PDU outlet."""
+
+    _attr_device_class = SwitchDeviceClass.OUTLET
+
+    def __init__(self, coordinator, unique_id_base, device_name, channel) -> None:
+        """Initialize the switch."""
+        super().__init__(coordinator, unique_id_base, device_name, "outputs", channel)
+        self._attr_unique_id = f"{unique_id_base}_gpio_{channel}"
+        self._attr_icon = "mdi:electric-switch"
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return the channel state."""
+        return self._channel_state.get("state")
+
+    async def async_turn_on(self, **kwargs) -> None:
+        """Switch the channel on."""
+        await self._async_switch(True)
+
+    async def async_turn_off(self, **kwargs) -> None:
+        """Switch the channel off."""
+        await self._async_switch(False)
+
+    async def _async_switch(self, state: bool) -> None:
+        try:
+            await self.coordinator.async_gpio_switch(self._channel, state)
+        except PiKVMRequestError as err:
+            raise HomeAssistantError(
+                f"Failed to switch GPIO channel {self._channel}: {err}"
+            ) from err
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up PiKVM switches from a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    unique_id_base = get_unique_id_base(config_entry, coordinator)
+    device_name = get_device_name(coordinator)
+
+    entities = [PiKVMAtxPowerSwitch(coordinator, unique_id_base, device_name)]
+    entities.extend(
+        PiKVMGpioSwitch(coordinator, unique_id_base, device_name, channel)
+        for channel, scheme in get_gpio_channels(coordinator, "outputs").items()
+        if scheme.get("switch")
+    )
+    async_add_entities(entities)
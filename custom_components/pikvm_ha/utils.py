@@ -8,14 +8,26 @@ from homeassistant import config_entries
 from homeassistant.helpers.translation import async_get_translations
 
 from .const import (
+    CONF_ADDITIONAL_ADDRESSES,
+    CONF_DEADBAND_CPU_TEMP,
+    CONF_DEADBAND_CPU_UTILIZATION,
+    CONF_DEADBAND_FAN_SPEED,
+    CONF_DEADBAND_MEMORY_UTILIZATION,
     CONF_HOST,
+    CONF_MAX_WRITE_SILENCE,
+    CONF_MIN_WRITE_INTERVAL,
     CONF_PASSWORD,
+    CONF_SNAPSHOT_INTERVAL,
+    CONF_SNAPSHOT_MAX_SIZE_MB,
+    CONF_SNAPSHOT_RETENTION_DAYS,
     CONF_USERNAME,
     CONF_TOTP,
     DEFAULT_PASSWORD,
     DEFAULT_USERNAME,
     DOMAIN,
+    OPTIONS_DEFAULTS,
 )
+from .entry_index import async_get_serial_index
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,6 +55,66 @@ def create_data_schema(user_input):
     )
 
 
+def create_options_schema(user_input, options):
+    """Create the options form schema: connection settings plus integration options."""
+
+    def _default(key):
+        return options.get(key, OPTIONS_DEFAULTS[key])
+
+    return create_data_schema(user_input).extend(
+        {
+            vol.Optional(
+                CONF_SNAPSHOT_INTERVAL, default=_default(CONF_SNAPSHOT_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_SNAPSHOT_RETENTION_DAYS,
+                default=_default(CONF_SNAPSHOT_RETENTION_DAYS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_SNAPSHOT_MAX_SIZE_MB, default=_default(CONF_SNAPSHOT_MAX_SIZE_MB)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_DEADBAND_CPU_TEMP, default=_default(CONF_DEADBAND_CPU_TEMP)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_DEADBAND_CPU_UTILIZATION,
+                default=_default(CONF_DEADBAND_CPU_UTILIZATION),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_DEADBAND_MEMORY_UTILIZATION,
+                default=_default(CONF_DEADBAND_MEMORY_UTILIZATION),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_DEADBAND_FAN_SPEED, default=_default(CONF_DEADBAND_FAN_SPEED)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_MIN_WRITE_INTERVAL, default=_default(CONF_MIN_WRITE_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_MAX_WRITE_SILENCE, default=_default(CONF_MAX_WRITE_SILENCE)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_ADDITIONAL_ADDRESSES,
+                default=_default(CONF_ADDITIONAL_ADDRESSES),
+            ): str,
+        }
+    )
+
+
+def parse_addresses(value: str) -> list[str]:
+    """Split a comma separated list of addresses, dropping empty items."""
+    return [address.strip() for address in value.split(",") if address.strip()]
+
+
+def extract_options(user_input, options):
+    """Move integration options out of submitted form data into a new options dict."""
+    updated_options = dict(options)
+    for key in OPTIONS_DEFAULTS:
+        if key in user_input:
+            updated_options[key] = user_input.pop(key)
+    return updated_options
+
+
 def update_existing_entry(hass: HomeAssistant | None, existing_entry, user_input):
     """Update an existing config entry."""
     updated_data = existing_entry.data.copy()
@@ -58,15 +130,11 @@ def find_existing_entry(flow_handler, serial) -> config_entries.ConfigEntry | No
     """Find an existing entry with the same serial number."""
     if not serial:
         return None
-    
-    existing_entries = flow_handler._async_current_entries()
-    for entry in existing_entries:
-        entry_serial = entry.data.get("serial")
-        _LOGGER.debug("Checking existing %s against %s", entry_serial, serial)
-        if entry_serial and entry_serial.lower() == serial.lower():
-            return entry
-    _LOGGER.debug("No existing entry found for %s, configuring", serial)
-    return None
+
+    entry = async_get_serial_index(flow_handler.hass).async_get_entry(serial)
+    if entry is None:
+        _LOGGER.debug("No existing entry found for %s, configuring", serial)
+    return entry
 
 
 async def get_translations(hass: HomeAssistant, language, domain):
@@ -87,6 +155,38 @@ def get_unique_id_base(config_entry, coordinator):
     return f"{config_entry.entry_id}_{serial}"
 
 
+def get_device_name(coordinator):
+    """Return the device name used as a prefix for entity names."""
+    device_name = get_nested_value(
+        coordinator.data, ["meta", "server", "host"], "pikvm"
+    )
+    # Use the domain if the device name is "localhost.localdomain"
+    if device_name == "localhost.localdomain":
+        return DOMAIN
+    return device_name.replace(".", "_")
+
+
+def get_gpio_channels(coordinator, direction):
+    """Return the GPIO channel scheme of "inputs" or "outputs", keyed by channel."""
+    return get_nested_value(
+        coordinator.data, ["gpio", "model", "scheme", direction], {}
+    ) or {}
+
+
+def deep_merge(base, update):
+    """Return a copy of base with update merged in recursively.
+
+    kvmd may push either complete states or partial diffs; merging handles both.
+    """
+    merged = dict(base)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
 def get_nested_value(data, keys, default=None):
     """Safely get a nested value from a dictionary.
 
@@ -0,0 +1,104 @@
+"""Persistent kvmd websocket connection for push updates."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from homeassistant.core import callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import PiKVMDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+HEARTBEAT = 15
+MIN_BACKOFF = 1
+MAX_BACKOFF = 60
+
+
+class PiKVMEventStream:
+    """Keep a websocket open to kvmd and feed its events to the coordinator."""
+
+    def __init__(self, coordinator: PiKVMDataUpdateCoordinator) -> None:
+        """Initialize the event stream."""
+        self.coordinator = coordinator
+        self._task: asyncio.Task | None = None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the websocket is open."""
+        return self._ws is not None and not self._ws.closed
+
+    @callback
+    def async_start(self) -> None:
+        """Start the background connection loop."""
+        if self._task is not None:
+            return
+        self._task = self.coordinator.config_entry.async_create_background_task(
+            self.coordinator.hass,
+            self._async_run(),
+            f"{DOMAIN} event stream {self.coordinator.url}",
+        )
+
+    async def async_stop(self) -> None:
+        """Stop the connection loop and close the websocket."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def async_send(self, event_type: str, event: dict) -> None:
+        """Send an event to kvmd over the open websocket."""
+        if not self.connected:
+            raise ConnectionError(f"Event stream to {self.coordinator.url} is not connected")
+        await self._ws.send_json({"event_type": event_type, "event": event})
+
+    async def _async_run(self) -> None:
+        backoff = MIN_BACKOFF
+        while True:
+            try:
+                await self._async_listen()
+                backoff = MIN_BACKOFF
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+                _LOGGER.debug(
+                    "Event stream to %s failed: %s. Reconnecting in %s seconds",
+                    self.coordinator.url,
+                    err,
+                    backoff,
+                )
+            finally:
+                self._ws = None
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF)
+
+    async def _async_listen(self) -> None:
+        session = await self.coordinator.async_get_client_session()
+        # stream=0 keeps this client from waking up the video encoder.
+        async with session.ws_connect(
+            f"{self.coordinator.url}/api/ws",
+            params={"stream": 0},
+            auth=self.coordinator.get_client_auth(),
+            heartbeat=HEARTBEAT,
+        ) as ws:
+            self._ws = ws
+            _LOGGER.debug("Event stream connected to %s", self.coordinator.url)
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    if message.type == aiohttp.WSMsgType.ERROR:
+                        raise aiohttp.ClientError(ws.exception())
+                    continue
+                data = message.json()
+                event_type = data.get("event_type")
+                event = data.get("event")
+                if event_type and event_type.endswith("_state") and isinstance(event, dict):
+                    self.coordinator.async_handle_event(event_type, event)
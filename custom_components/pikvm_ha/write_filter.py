@@ -0,0 +1,103 @@
+"""Deadband filtering of PiKVM sensor state writes.
+
+Health readings such as the CPU temperature jitter by a fraction of a unit on
+every poll. Writing each of those to the state machine costs a state changed
+event, a recorder row and a frontend update for no information. A sensor value
+is only written when it moved at least its deadband away from the value last
+written; comparing against the last *written* value rather than the previous
+reading means a slow drift is still reported once it adds up.
+
+Two intervals bound the filter in time: no more than one write per
+min_interval, and at least one write per max_silence so graphs and
+automations relying on last_reported keep moving.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import (
+    CONF_DEADBAND_CPU_TEMP,
+    CONF_DEADBAND_CPU_UTILIZATION,
+    CONF_DEADBAND_FAN_SPEED,
+    CONF_DEADBAND_MEMORY_UTILIZATION,
+    CONF_MAX_WRITE_SILENCE,
+    CONF_MIN_WRITE_INTERVAL,
+    OPTIONS_DEFAULTS,
+)
+
+# Sensor type -> option holding its deadband
+DEADBAND_OPTIONS = {
+    "cpu_temp": CONF_DEADBAND_CPU_TEMP,
+    "cpu_utilization": CONF_DEADBAND_CPU_UTILIZATION,
+    "memory_utilization": CONF_DEADBAND_MEMORY_UTILIZATION,
+    "fan_speed": CONF_DEADBAND_FAN_SPEED,
+}
+
+
+@dataclass
+class WriteFilter:
+    """Decide whether a new sensor value is worth writing."""
+
+    deadbands: dict[str, float] = field(default_factory=dict)
+    min_interval: float = 0.0
+    max_silence: float = 0.0
+    # Sensor type -> {"written": n, "suppressed": n}
+    counts: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> WriteFilter:
+        """Build a filter from the options of a config entry."""
+
+        def option(key: str) -> float:
+            return float(options.get(key, OPTIONS_DEFAULTS[key]))
+
+        return cls(
+            deadbands={
+                sensor_type: option(key) for sensor_type, key in DEADBAND_OPTIONS.items()
+            },
+            min_interval=option(CONF_MIN_WRITE_INTERVAL),
+            max_silence=option(CONF_MAX_WRITE_SILENCE),
+        )
+
+    def applies_to(self, sensor_type: str) -> bool:
+        """Return whether values of this sensor type are filtered."""
+        return sensor_type in self.deadbands
+
+    def should_write(
+        self,
+        sensor_type: str,
+        now: float,
+        last_time: float | None,
+        last_value: Any,
+        value: Any,
+    ) -> bool:
+        """Return whether value should be written, and count the decision.
+
+        last_time is None when nothing was written yet. Values that are not
+        numbers, or that change to or from None, are always written.
+        """
+        write = self._should_write(sensor_type, now, last_time, last_value, value)
+        self.count(sensor_type, write)
+        return write
+
+    def count(self, sensor_type: str, written: bool) -> None:
+        """Count a write, or a suppressed one, of a filtered sensor."""
+        counts = self.counts.setdefault(sensor_type, {"written": 0, "suppressed": 0})
+        counts["written" if written else "suppressed"] += 1
+
+    def _should_write(self, sensor_type, now, last_time, last_value, value) -> bool:
+        if last_time is None:
+            return True
+        elapsed = now - last_time
+        if self.max_silence and elapsed >= self.max_silence:
+            return True
+        if elapsed < self.min_interval:
+            return False
+        try:
+            delta = abs(float(value) - float(last_value))
+        except (TypeError, ValueError):
+            return value != last_value
+        return delta >= self.deadbands.get(sensor_type, 0.0) and delta > 0
@@ -0,0 +1,87 @@
+"""Micro-benchmark of sensor value extraction per coordinator update.
+
+Compares walking the coordinator data with get_nested_value for every state
+and attribute read, as the sensors used to do, with building one snapshot
+per update and reading its fields. Run with::
+
+    python -m tests.benchmark_snapshot [extras]
+"""
+
+import sys
+import timeit
+
+from custom_components.pikvm_ha.snapshot import SnapshotSchema
+from custom_components.pikvm_ha.utils import get_nested_value
+
+# Paths read per update by the built-in sensors. Paths are read for the state
+# and again for the attributes; MSD storage read its path three times because
+# its attributes called the state property again.
+BUILTIN_READS = [
+    ("hw", "health", "temp", "cpu"),
+    ("hw", "health", "temp", "cpu"),
+    ("hw", "health", "cpu"),
+    ("hw", "health", "cpu"),
+    ("hw", "health", "mem"),
+    ("hw", "health", "mem"),
+    ("hw", "health", "mem"),
+    ("fan",),
+    ("fan", "state"),
+    ("fan", "state"),
+    ("hw", "health", "throttling"),
+    ("hw", "health", "throttling"),
+    ("msd", "enabled"),
+    ("msd", "drive"),
+    ("msd", "drive"),
+    ("msd", "storage"),
+    ("msd", "storage"),
+    ("msd", "storage"),
+]
+
+
+def build_data(extras: int) -> dict:
+    """Return coordinator data resembling a device with many extras."""
+    return {
+        "hw": {
+            "health": {
+                "temp": {"cpu": 47.2},
+                "cpu": {"percent": 12},
+                "mem": {"percent": 40, "available": 1 << 29, "total": 1 << 30},
+                "throttling": {"raw_flags": 0, "parsed_flags": {}},
+            }
+        },
+        "fan": {"state": {"fan": {"speed": 40}, "hall": {"available": False}}},
+        "msd": {
+            "enabled": True,
+            "drive": {"connected": False, "image": None},
+            "storage": {"size": 1 << 34, "free": 1 << 33, "images": {}},
+        },
+        "extras": {f"extra_{index}": {"enabled": True} for index in range(extras)},
+    }
+
+
+def main(extras: int) -> None:
+    """Print the per-update cost of both approaches."""
+    data = build_data(extras)
+    extra_reads = [("extras", f"extra_{index}") for index in range(extras)] * 2
+    reads = BUILTIN_READS + extra_reads
+
+    schema = SnapshotSchema()
+    slots = [schema.register(keys) for keys in reads]
+
+    def before():
+        for keys in reads:
+            get_nested_value(data, keys)
+
+    def after():
+        snapshot = schema.build(data)
+        for slot in slots:
+            getattr(snapshot, slot)
+
+    number = 2000
+    for label, function in (("get_nested_value", before), ("snapshot", after)):
+        best = min(timeit.repeat(function, number=number, repeat=5)) / number
+        print(f"{label:>16}: {best * 1e6:8.1f} µs per update ({len(reads)} reads)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
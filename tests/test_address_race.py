@@ -0,0 +1,63 @@
+"""Tests for racing connections across the addresses of a PiKVM."""
+
+import asyncio
+import socket
+
+import pytest
+
+from custom_components.pikvm_ha.address_race import (
+    address_url,
+    async_race,
+    is_usable_address,
+)
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.parametrize(
+    ("address", "base_url", "url"),
+    [
+        ("192.168.1.5", "https://pikvm.local", "https://192.168.1.5"),
+        ("2001:db8::5", "https://10.0.0.2", "https://[2001:db8::5]"),
+        ("pikvm.local", "https://10.0.0.2:8443", "https://pikvm.local:8443"),
+        ("2001:db8::5", "http://10.0.0.2:8080", "http://[2001:db8::5]:8080"),
+    ],
+)
+def test_address_url(address, base_url, url):
+    """Addresses keep the scheme and port of the configured URL."""
+    assert address_url(address, base_url) == url
+
+
+def test_is_usable_address():
+    """Link-local IPv6 and loopback addresses are not candidates."""
+    assert is_usable_address("2001:db8::5")
+    assert is_usable_address("pikvm.local")
+    assert not is_usable_address("fe80::1")
+    assert not is_usable_address("127.0.0.1")
+
+
+async def test_race_fails_over_to_a_listening_address():
+    """A refused candidate starts the next one without waiting out the delay."""
+    server = await asyncio.start_server(lambda _r, w: w.close(), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    loop = asyncio.get_running_loop()
+    try:
+        started = loop.time()
+        winner = await async_race(
+            [("127.0.0.1", _closed_port()), ("127.0.0.1", port)], attempt_delay=5
+        )
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert winner == 1
+    assert loop.time() - started < 1
+
+
+async def test_race_without_responsive_address():
+    """No winner is returned when every candidate refuses."""
+    assert await async_race([("127.0.0.1", _closed_port())] * 2) is None
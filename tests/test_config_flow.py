@@ -448,6 +448,35 @@ async def test_async_step_zeroconf_existing_entry(hass):
     update_mock.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_async_step_integration_discovery_keeps_known_host(hass):
+    """A scan finding a device at its configured address changes nothing."""
+    existing_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "https://192.168.1.5", CONF_SERIAL: "serial"},
+    )
+
+    with (
+        patch(
+            "custom_components.pikvm_ha.config_flow.find_existing_entry",
+            return_value=existing_entry,
+        ),
+        patch(
+            "custom_components.pikvm_ha.config_flow.update_existing_entry",
+            autospec=True,
+        ) as update_mock,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+            data={"host": "192.168.1.5", CONF_SERIAL: "serial"},
+        )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    update_mock.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_async_step_zeroconf_new_device_menu(hass):
     """New Zeroconf discoveries prompt a confirmation menu."""
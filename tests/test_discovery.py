@@ -0,0 +1,71 @@
+"""Tests for the coalescing of repeated PiKVM discoveries."""
+
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.pikvm_ha.const import (
+    CONF_ADDITIONAL_ADDRESSES,
+    CONF_HOST,
+    DOMAIN,
+)
+from custom_components.pikvm_ha.discovery import (
+    DISCOVERY_WINDOW,
+    async_get_discovery_coalescer,
+    async_resolve_entry_addresses,
+    host_moved,
+)
+
+
+def test_host_moved_ignores_other_addresses_of_the_device():
+    """A device announced on another interface has not moved."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "https://192.168.1.5"})
+
+    assert not host_moved(entry, "10.0.0.2", ["10.0.0.2", "192.168.1.5"])
+    assert host_moved(entry, "10.0.0.2", ["10.0.0.2", "pikvm.local."])
+
+
+def test_host_moved_matches_configured_hostname():
+    """An entry configured by hostname keeps it."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "pikvm.local"})
+
+    assert not host_moved(entry, "192.168.1.5", ["192.168.1.5", "PiKVM.local."])
+
+
+async def test_discoveries_are_coalesced_per_serial(hass):
+    """The first discovery applies at once, the latest of a window at its end."""
+    coalescer = async_get_discovery_coalescer(hass)
+    applied = []
+
+    assert coalescer.async_discovered("serial", lambda: applied.append("first"))
+    assert coalescer.async_discovered("other", lambda: applied.append("other"))
+    assert not coalescer.async_discovered("serial", lambda: applied.append("second"))
+    assert not coalescer.async_discovered("serial", lambda: applied.append("third"))
+    assert applied == ["first", "other"]
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=DISCOVERY_WINDOW + 1)
+    )
+    await hass.async_block_till_done()
+
+    assert applied == ["first", "other", "third"]
+
+
+async def test_entry_addresses_include_additional_addresses(hass):
+    """A scanned address matches the host or any additional address."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "https://192.168.1.5"},
+        options={CONF_ADDITIONAL_ADDRESSES: "10.0.0.2, https://[2001:db8::5]"},
+    )
+
+    assert await async_resolve_entry_addresses(entry) == {
+        "192.168.1.5",
+        "10.0.0.2",
+        "2001:db8::5",
+    }
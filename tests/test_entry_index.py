@@ -0,0 +1,44 @@
+"""Tests for the serial index of PiKVM config entries."""
+
+from homeassistant.config_entries import SOURCE_IGNORE
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pikvm_ha.const import CONF_HOST, CONF_SERIAL, DOMAIN
+from custom_components.pikvm_ha.entry_index import async_get_serial_index
+
+
+async def test_index_finds_entries_by_serial_and_unique_id(hass):
+    """Entries are found by data serial or unique ID, regardless of case."""
+    by_data = MockConfigEntry(domain=DOMAIN, data={CONF_SERIAL: "ABC123"})
+    by_data.add_to_hass(hass)
+    by_unique_id = MockConfigEntry(domain=DOMAIN, unique_id="def456", data={})
+    by_unique_id.add_to_hass(hass)
+    ignored = MockConfigEntry(
+        domain=DOMAIN, unique_id="ghi789", data={}, source=SOURCE_IGNORE
+    )
+    ignored.add_to_hass(hass)
+
+    index = async_get_serial_index(hass)
+
+    assert index.async_get_entry("abc123") is by_data
+    assert index.async_get_entry(" DEF456 ") is by_unique_id
+    assert index.async_get_entry("ghi789") is None
+    assert index.async_get_entry(None) is None
+
+
+async def test_index_follows_entry_changes(hass):
+    """Updated and removed entries are reflected in the index."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, unique_id="old", data={CONF_SERIAL: "old", CONF_HOST: "h"}
+    )
+    entry.add_to_hass(hass)
+    index = async_get_serial_index(hass)
+
+    hass.config_entries.async_update_entry(
+        entry, unique_id="new", data={**entry.data, CONF_SERIAL: "new"}
+    )
+    assert index.async_get_entry("old") is None
+    assert index.async_get_entry("new") is entry
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    assert index.async_get_entry("new") is None
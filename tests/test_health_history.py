@@ -0,0 +1,68 @@
+"""Tests for the PiKVM health history ring buffer."""
+
+import random
+
+import pytest
+
+from custom_components.pikvm_ha.health_history import HealthHistory, RollingSeries
+
+
+def test_rolling_series_is_empty_without_samples():
+    """No statistics are reported before the first sample."""
+    assert RollingSeries(4).stats() is None
+
+
+def test_rolling_series_matches_full_recomputation():
+    """Incremental statistics equal a recomputation over the window."""
+    rng = random.Random(1234)
+    series = RollingSeries(16)
+    samples = []
+    for second in range(200):
+        value = rng.uniform(30, 80)
+        series.add(second * 30.0, value)
+        samples.append((second * 30.0, value))
+        window = samples[-16:]
+        values = [value for _, value in window]
+        stats = series.stats()
+        assert len(series) == len(window)
+        assert stats["min"] == min(values)
+        assert stats["max"] == max(values)
+        assert stats["mean"] == pytest.approx(sum(values) / len(values))
+        if len(window) > 1:
+            expected_rate = (
+                (window[-1][1] - window[0][1]) / (window[-1][0] - window[0][0]) * 60
+            )
+            assert stats["rate_per_min"] == pytest.approx(expected_rate)
+
+
+def test_health_history_skips_missing_metrics():
+    """Metrics absent from an update are not recorded."""
+    history = HealthHistory(8)
+    history.add_sample(0, {"hw": {"health": {"temp": {"cpu": 41.5}}}})
+    history.add_sample(60, {"hw": {"health": {"temp": {"cpu": 43.5}}}})
+
+    assert history.stats("cpu_temp") == {
+        "min": 41.5,
+        "mean": 42.5,
+        "max": 43.5,
+        "rate_per_min": 2.0,
+    }
+    assert history.stats("mem_percent") is None
+
+
+def test_health_history_prefers_fan_rpm_when_hall_sensor_available():
+    """Fan history uses the RPM of the hall sensor if it is present."""
+    history = HealthHistory(8)
+    history.add_sample(
+        0,
+        {
+            "fan": {
+                "state": {
+                    "fan": {"speed": 40},
+                    "hall": {"available": True, "rpm": 2100},
+                }
+            }
+        },
+    )
+
+    assert history.stats("fan")["max"] == 2100
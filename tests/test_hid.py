@@ -0,0 +1,107 @@
+"""Tests for PiKVM keyboard input helpers."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.pikvm_ha.hid import (
+    async_send_key_events,
+    combo_to_key_events,
+    text_to_key_events,
+)
+
+
+class _FailingStream:
+    """Event stream that drops its connection after a number of events."""
+
+    def __init__(self, fail_at: int) -> None:
+        self.sent: list[tuple[str, bool]] = []
+        self._fail_at = fail_at
+
+    async def async_send(self, event_type: str, event: dict) -> None:
+        if len(self.sent) == self._fail_at:
+            self._fail_at = -1
+            raise ConnectionError("connection lost")
+        self.sent.append((event["key"], event["state"]))
+
+
+def test_text_to_key_events_presses_and_releases_each_key():
+    """Every character becomes a press followed by a release."""
+    assert text_to_key_events("a1") == [
+        ("KeyA", True),
+        ("KeyA", False),
+        ("Digit1", True),
+        ("Digit1", False),
+    ]
+
+
+def test_text_to_key_events_holds_shift_across_runs():
+    """Shift is pressed once for a run of shifted characters."""
+    assert text_to_key_events("AB!c") == [
+        ("ShiftLeft", True),
+        ("KeyA", True),
+        ("KeyA", False),
+        ("KeyB", True),
+        ("KeyB", False),
+        ("Digit1", True),
+        ("Digit1", False),
+        ("ShiftLeft", False),
+        ("KeyC", True),
+        ("KeyC", False),
+    ]
+
+
+def test_text_to_key_events_releases_trailing_shift():
+    """Shift is never left pressed at the end of the text."""
+    assert text_to_key_events("?")[-1] == ("ShiftLeft", False)
+
+
+def test_text_to_key_events_rejects_unknown_characters():
+    """Characters outside the US layout are reported."""
+    with pytest.raises(ValueError):
+        text_to_key_events("é")
+
+
+def test_combo_to_key_events_releases_in_reverse_order():
+    """Combos press keys in order and release them in reverse."""
+    assert combo_to_key_events("ControlLeft+AltLeft+Delete") == [
+        ("ControlLeft", True),
+        ("AltLeft", True),
+        ("Delete", True),
+        ("Delete", False),
+        ("AltLeft", False),
+        ("ControlLeft", False),
+    ]
+
+
+def test_combo_to_key_events_rejects_empty_combo():
+    """An empty combo is invalid."""
+    with pytest.raises(ValueError):
+        combo_to_key_events(" + ")
+
+
+async def test_send_key_events_releases_held_keys_on_failure():
+    """Modifiers pressed before a failure are released again."""
+    stream = _FailingStream(fail_at=2)
+    coordinator = SimpleNamespace(event_stream=stream, push_state={})
+
+    with pytest.raises(ConnectionError):
+        await async_send_key_events(
+            coordinator, combo_to_key_events("ControlLeft+AltLeft+Delete")
+        )
+
+    assert stream.sent == [
+        ("ControlLeft", True),
+        ("AltLeft", True),
+        ("Delete", False),
+        ("AltLeft", False),
+        ("ControlLeft", False),
+    ]
+
+
+async def test_send_key_events_without_event_stream():
+    """Keys cannot be sent before the event stream exists."""
+    coordinator = SimpleNamespace(event_stream=None, push_state={})
+
+    with pytest.raises(ConnectionError):
+        await async_send_key_events(coordinator, [("KeyA", True), ("KeyA", False)])
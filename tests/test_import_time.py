@@ -0,0 +1,28 @@
+"""Guard against heavy imports when the integration is loaded.
+
+Wall-clock import budgets are unreliable on shared CI runners, so this checks
+what gets imported instead of how long it takes.
+"""
+
+import subprocess
+import sys
+
+PACKAGE = "custom_components.pikvm_ha"
+# Only needed once a device is contacted or a flow is shown
+DEFERRED_MODULES = ("OpenSSL", "pyotp", "requests", "urllib3")
+
+
+def test_heavy_modules_are_not_imported():
+    """Loading the integration does not import dependencies needed later."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, {PACKAGE}; "
+            f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert result.stdout.strip() == ""
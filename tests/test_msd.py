@@ -0,0 +1,78 @@
+"""Tests for PiKVM MSD image transfers."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.pikvm_ha.const import DOMAIN
+from custom_components.pikvm_ha.coordinator import PiKVMRequestError
+from custom_components.pikvm_ha.msd import async_cancel_transfer, async_run_transfer
+from custom_components.pikvm_ha.services import _async_msd_upload
+
+
+def _coordinator(hass):
+    return SimpleNamespace(hass=hass, url="https://pikvm.local", msd_transfer_task=None)
+
+
+async def test_cancelled_upload_raises_a_service_error(hass):
+    """Cancelling the transfer fails the upload call instead of cancelling it."""
+    coordinator = _coordinator(hass)
+    hass.data[DOMAIN] = {"entry": coordinator}
+    index = MagicMock()
+    index.async_hash_file = AsyncMock(return_value=(4, "sha256"))
+    index.async_prepare_upload = AsyncMock(return_value=True)
+    started = asyncio.Event()
+
+    async def _upload(*_args):
+        started.set()
+        await asyncio.Event().wait()
+
+    call = SimpleNamespace(
+        hass=hass,
+        data={
+            "config_entry_id": "entry",
+            "path": "/media/debian.iso",
+            "force": False,
+            "max_rate": 0,
+        },
+    )
+    with (
+        patch(
+            "custom_components.pikvm_ha.services._async_validate_source",
+            AsyncMock(return_value=4),
+        ),
+        patch(
+            "custom_components.pikvm_ha.services.async_get_image_index",
+            AsyncMock(return_value=index),
+        ),
+        patch("custom_components.pikvm_ha.services.async_iter_file"),
+        patch("custom_components.pikvm_ha.services.async_upload_image", _upload),
+    ):
+        upload = asyncio.ensure_future(_async_msd_upload(call))
+        await started.wait()
+        assert async_cancel_transfer(coordinator)
+
+        with pytest.raises(HomeAssistantError, match="Upload cancelled"):
+            await upload
+
+    index.async_record_upload.assert_not_called()
+    assert coordinator.msd_transfer_task is None
+
+
+async def test_second_transfer_is_refused_and_closed(hass):
+    """A transfer refused while another one runs is closed, not leaked."""
+    coordinator = _coordinator(hass)
+    coordinator.msd_transfer_task = MagicMock()
+
+    async def _transfer():
+        raise AssertionError("must not run")
+
+    transfer = _transfer()
+    with pytest.raises(PiKVMRequestError):
+        await async_run_transfer(coordinator, transfer)
+
+    assert transfer.cr_frame is None
@@ -0,0 +1,26 @@
+"""Tests for the PiKVM network scanner."""
+
+import pytest
+
+from custom_components.pikvm_ha.scanner import scan_hosts
+
+
+def test_scan_hosts_expands_and_deduplicates_networks():
+    """Overlapping networks are probed once per address."""
+    hosts = scan_hosts(["10.0.0.0/30", "10.0.0.2/32", "10.0.1.7"])
+
+    assert hosts == ["10.0.0.1", "10.0.0.2", "10.0.1.7"]
+
+
+def test_scan_hosts_covers_a_22():
+    """A /22 is scanned without its network and broadcast addresses."""
+    assert len(scan_hosts(["10.20.0.0/22"])) == 1022
+
+
+@pytest.mark.parametrize(
+    "networks", [["not-a-network"], ["10.0.0.0/8"], ["10.0.0.0/16", "10.1.0.0/24"]]
+)
+def test_scan_hosts_rejects_invalid_or_huge_networks(networks):
+    """Invalid networks and scans above the address limit are refused."""
+    with pytest.raises(ValueError):
+        scan_hosts(networks)
@@ -0,0 +1,68 @@
+"""Tests for the per-update sensor snapshot."""
+
+import pytest
+
+from custom_components.pikvm_ha.snapshot import SnapshotSchema, compile_path
+from custom_components.pikvm_ha.utils import get_nested_value
+
+DATA = {
+    "hw": {"health": {"temp": {"cpu": 45.1}, "throttling": {}}},
+    "msd": {"enabled": False, "storage": {"size": 100, "free": 25}},
+    "extras": {"janus": {"enabled": True}},
+}
+
+
+@pytest.mark.parametrize(
+    "keys",
+    [
+        ("hw", "health", "temp", "cpu"),
+        ("hw", "health", "throttling"),
+        ("hw", "health", "missing", "deeper"),
+        ("msd", "enabled"),
+        ("msd", "storage", "free", "not_a_dict"),
+        ("extras", "janus"),
+    ],
+)
+def test_compiled_path_matches_get_nested_value(keys):
+    """Compiled accessors return what get_nested_value returns by default."""
+    assert compile_path(keys)(DATA) == get_nested_value(DATA, list(keys))
+
+
+def test_compiled_path_handles_missing_data():
+    """A coordinator without data yields None for every path."""
+    assert compile_path(("msd", "enabled"))(None) is None
+
+
+def test_schema_shares_slots_between_identical_paths():
+    """Sensors reading the same path share one snapshot field."""
+    schema = SnapshotSchema()
+    first = schema.register(("msd", "storage"))
+    second = schema.register(["msd", "storage"])
+    other = schema.register(("msd", "enabled"))
+
+    assert first == second
+    assert first != other
+    assert schema.version == 2
+
+
+def test_snapshot_is_flat_and_slotted():
+    """A snapshot holds one attribute per path and nothing else."""
+    schema = SnapshotSchema()
+    temp = schema.register(("hw", "health", "temp", "cpu"))
+    enabled = schema.register(("msd", "enabled"))
+
+    snapshot = schema.build(DATA)
+
+    assert getattr(snapshot, temp) == 45.1
+    assert getattr(snapshot, enabled) is False
+    assert not hasattr(snapshot, "__dict__")
+
+
+def test_schema_grows_after_snapshots_were_built():
+    """Paths registered later are part of the next snapshot."""
+    schema = SnapshotSchema()
+    schema.register(("msd", "enabled"))
+    schema.build(DATA)
+    janus = schema.register(("extras", "janus"))
+
+    assert getattr(schema.build(DATA), janus) == {"enabled": True}
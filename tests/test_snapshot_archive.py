@@ -0,0 +1,130 @@
+"""Tests for the PiKVM snapshot archive store."""
+
+import os
+from unittest.mock import MagicMock
+
+from custom_components.pikvm_ha.snapshot_archive import (
+    INDEX_RECORD,
+    PendingSnapshot,
+    RetentionPolicy,
+    SnapshotArchive,
+    SnapshotArchiveStore,
+    snapshot_digest,
+)
+
+
+def _pending(device, timestamp, data):
+    return PendingSnapshot(device, timestamp, snapshot_digest(data), data)
+
+
+def _object_count(store):
+    return sum(len(files) for _, _, files in os.walk(store.objects_dir))
+
+
+def test_identical_frames_extend_the_last_record(tmp_path):
+    """Consecutive identical frames collapse into a single timeline record."""
+    store = SnapshotArchiveStore(str(tmp_path))
+    store.write_batch(
+        [
+            _pending("pikvm-1", 100, b"frame-a"),
+            _pending("pikvm-1", 160, b"frame-a"),
+            _pending("pikvm-1", 220, b"frame-a"),
+            _pending("pikvm-1", 280, b"frame-b"),
+        ]
+    )
+
+    records = store.read_index("pikvm-1")
+    assert [(first, last) for first, last, _ in records] == [(100, 220), (280, 280)]
+    assert os.path.getsize(store._index_path("pikvm-1")) == 2 * INDEX_RECORD.size
+    assert _object_count(store) == 2
+
+
+def test_frames_are_shared_between_devices(tmp_path):
+    """The same frame from two devices is stored once."""
+    store = SnapshotArchiveStore(str(tmp_path))
+    store.write_batch(
+        [_pending("pikvm-1", 100, b"no-signal"), _pending("pikvm-2", 100, b"no-signal")]
+    )
+
+    assert _object_count(store) == 1
+    assert len(store.read_index("pikvm-1")) == 1
+    assert len(store.read_index("pikvm-2")) == 1
+
+
+def test_prune_by_age_removes_unreferenced_objects(tmp_path):
+    """Records older than the retention window and their frames are removed."""
+    store = SnapshotArchiveStore(str(tmp_path))
+    store.write_batch(
+        [_pending("pikvm-1", 100, b"old"), _pending("pikvm-1", 1000, b"new")]
+    )
+
+    store.prune({"pikvm-1": RetentionPolicy(max_age=500, max_bytes=1 << 20)}, 1200)
+
+    records = store.read_index("pikvm-1")
+    assert [digest for _, _, digest in records] == [snapshot_digest(b"new")]
+    assert _object_count(store) == 1
+
+
+def test_prune_by_size_keeps_newest_frames(tmp_path):
+    """The size budget is spent on the newest frames first."""
+    store = SnapshotArchiveStore(str(tmp_path))
+    store.write_batch(
+        [
+            _pending("pikvm-1", 100, b"a" * 100),
+            _pending("pikvm-1", 200, b"b" * 100),
+            _pending("pikvm-1", 300, b"c" * 100),
+        ]
+    )
+
+    store.prune({"pikvm-1": RetentionPolicy(max_age=10_000, max_bytes=250)}, 400)
+
+    records = store.read_index("pikvm-1")
+    assert [first for first, _, _ in records] == [200, 300]
+    assert _object_count(store) == 2
+
+
+def test_garbage_collection_keeps_objects_being_written(tmp_path):
+    """An object still in its temporary file is not collected."""
+    store = SnapshotArchiveStore(str(tmp_path))
+    store.write_batch([_pending("pikvm-1", 100, b"frame")])
+    bucket = os.path.join(store.objects_dir, "ab")
+    os.makedirs(bucket)
+    with open(os.path.join(bucket, "cdef.tmp"), "wb") as file:
+        file.write(b"in flight")
+
+    store.collect_garbage()
+
+    assert _object_count(store) == 2
+
+
+async def test_failed_write_stores_the_next_duplicate(hass):
+    """A frame whose batch was lost is written again by its next duplicate."""
+    archive = SnapshotArchive(hass)
+    archive.store = MagicMock(spec=SnapshotArchiveStore)
+    archive.store.write_batch.side_effect = OSError("disk full")
+    archive.async_add("pikvm-1", b"frame")
+    await archive.async_flush()
+
+    archive.store.write_batch.side_effect = None
+    archive.async_add("pikvm-1", b"frame")
+    await archive.async_flush()
+
+    (batch,) = archive.store.write_batch.call_args.args
+    assert [item.data for item in batch] == [b"frame"]
+
+
+async def test_duplicate_of_a_pruned_frame_is_stored_again(hass, tmp_path):
+    """A frame pruned for exceeding the size budget is written again."""
+    archive = SnapshotArchive(hass)
+    archive.store = SnapshotArchiveStore(str(tmp_path))
+    archive.async_register("pikvm-1", max_age_days=7, max_size_mb=0)
+    archive.async_add("pikvm-1", b"frame")
+    await archive.async_prune()
+    assert _object_count(archive.store) == 0
+
+    archive.async_add("pikvm-1", b"frame")
+    await archive.async_unregister("pikvm-1")
+
+    (record,) = archive.store.read_index("pikvm-1")
+    assert record[2] == snapshot_digest(b"frame")
+    assert os.path.exists(archive.store._object_path(snapshot_digest(b"frame")))
@@ -0,0 +1,34 @@
+"""Tests for starting a PiKVM from its cached state."""
+
+from custom_components.pikvm_ha.coordinator import PiKVMDataUpdateCoordinator
+from custom_components.pikvm_ha.const import DOMAIN
+from custom_components.pikvm_ha.kvm_switch import get_active_port, get_ports
+from custom_components.pikvm_ha.state_cache import STORAGE_VERSION, PiKVMStateCache
+
+
+async def test_cached_switch_and_gpio_seed_the_pushed_state(hass, hass_storage, pikvm_cert):
+    """A restart from the cache creates the switch and GPIO entities again."""
+    ports = [{"name": "Server"}, {"name": ""}]
+    hass_storage[f"{DOMAIN}.state_cache.entry"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.state_cache.entry",
+        "data": {
+            "data": {
+                "hw": {"platform": {"serial": "serial"}},
+                "gpio": {"state": {"inputs": {"led": {"online": True, "state": True}}}},
+                "switch": {"model": {"ports": ports}, "summary": {"active_port": 1}},
+            }
+        },
+    }
+    coordinator = PiKVMDataUpdateCoordinator(
+        hass, "https://pikvm.local", "admin", "admin", "", pikvm_cert
+    )
+
+    coordinator.async_set_cached_data(
+        await PiKVMStateCache(hass, "entry").async_load()
+    )
+
+    assert coordinator.stale
+    assert get_ports(coordinator) == ports
+    assert get_active_port(coordinator) == 1
+    assert coordinator.push_state["gpio"]["inputs"]["led"]["state"] is True
@@ -0,0 +1,83 @@
+"""Tests for the deadband filter of sensor state writes."""
+
+from unittest.mock import patch
+
+from custom_components.pikvm_ha.const import (
+    CONF_DEADBAND_CPU_TEMP,
+    CONF_MAX_WRITE_SILENCE,
+    CONF_MIN_WRITE_INTERVAL,
+)
+from custom_components.pikvm_ha.coordinator import PiKVMDataUpdateCoordinator
+from custom_components.pikvm_ha.sensor import PiKVMBaseSensor
+from custom_components.pikvm_ha.write_filter import WriteFilter
+
+
+class _ConstantSensor(PiKVMBaseSensor):
+    """A CPU temperature sensor whose state never changes."""
+
+    available = True
+    state = "45.0"
+    extra_state_attributes = None
+
+
+def test_filter_uses_defaults_for_missing_options():
+    """Options not set on the entry fall back to their defaults."""
+    write_filter = WriteFilter.from_options({CONF_DEADBAND_CPU_TEMP: 1})
+
+    assert write_filter.deadbands["cpu_temp"] == 1.0
+    assert write_filter.deadbands["cpu_utilization"] == 2.0
+    assert write_filter.applies_to("fan_speed")
+    assert not write_filter.applies_to("msd_drive")
+
+
+def test_deadband_is_measured_from_last_written_value():
+    """Small steps are held back until they add up to the deadband."""
+    write_filter = WriteFilter.from_options({CONF_DEADBAND_CPU_TEMP: 0.5})
+
+    assert write_filter.should_write("cpu_temp", 0, None, None, 45.0)
+    assert not write_filter.should_write("cpu_temp", 30, 0, 45.0, 45.3)
+    assert write_filter.should_write("cpu_temp", 60, 0, 45.0, 45.6)
+    assert write_filter.counts["cpu_temp"] == {"written": 2, "suppressed": 1}
+
+
+def test_intervals_bound_the_filter():
+    """Writes are rate limited, but never silent longer than max_silence."""
+    write_filter = WriteFilter.from_options(
+        {CONF_MIN_WRITE_INTERVAL: 60, CONF_MAX_WRITE_SILENCE: 300}
+    )
+
+    assert not write_filter.should_write("cpu_utilization", 30, 0, 10, 90)
+    assert write_filter.should_write("cpu_utilization", 60, 0, 10, 90)
+    assert not write_filter.should_write("cpu_utilization", 120, 0, 10, 10)
+    assert write_filter.should_write("cpu_utilization", 300, 0, 10, 10)
+
+
+def test_non_numeric_values_are_written_when_changed():
+    """A value that becomes unknown is not subject to the deadband."""
+    write_filter = WriteFilter.from_options({})
+
+    assert write_filter.should_write("fan_speed", 30, 0, 2000, None)
+    assert not write_filter.should_write("fan_speed", 30, 0, None, None)
+
+
+async def test_constant_value_is_written_every_max_silence(hass, pikvm_cert):
+    """A steady sensor still reports once per max_silence."""
+    coordinator = PiKVMDataUpdateCoordinator(
+        hass, "https://pikvm.local", "admin", "admin", "", pikvm_cert
+    )
+    coordinator.write_filter = WriteFilter.from_options({CONF_MAX_WRITE_SILENCE: 300})
+    sensor = _ConstantSensor(coordinator, "serial", "cpu_temp", "CPU Temperature")
+
+    with (
+        patch.object(sensor, "async_write_ha_state") as write_ha_state,
+        patch("custom_components.pikvm_ha.sensor.time") as mock_time,
+    ):
+        for now in (0, 30, 299, 300, 330):
+            mock_time.monotonic.return_value = now
+            sensor._async_write_update()
+
+    assert write_ha_state.call_count == 2
+    assert coordinator.write_filter.counts["cpu_temp"] == {
+        "written": 2,
+        "suppressed": 3,
+    }